@@ -2,6 +2,7 @@
 Backup and restore functionality for the database
 """
 import shutil
+import sqlite3
 import os
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +15,22 @@ class BackupManager:
         self.db_file = db_file
         self.storage_dir = storage_dir
 
+    @staticmethod
+    def copy_database(source_file: str, target_file: str):
+        """
+        Copy a database with SQLite's online backup, which includes changes
+        still in the write-ahead log that a plain file copy would miss
+        """
+        source = sqlite3.connect(source_file)
+        try:
+            target = sqlite3.connect(target_file)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+        finally:
+            source.close()
+
     def create_backup(self, backup_path: str) -> bool:
         """
         Create a backup of the database and storage files
@@ -26,7 +43,7 @@ class BackupManager:
                 backup_path = os.path.join(backup_path, f"pycruds_backup_{timestamp}.db")
 
             # Copy database file
-            shutil.copy2(self.db_file, backup_path)
+            self.copy_database(self.db_file, backup_path)
 
             # Also backup storage directory if it exists
             if os.path.exists(self.storage_dir):
@@ -51,7 +68,7 @@ class BackupManager:
                 return False
 
             # Restore database
-            shutil.copy2(backup_path, self.db_file)
+            self.copy_database(backup_path, self.db_file)
 
             # Restore storage if exists
             storage_backup = backup_path.replace('.db', '_storage')
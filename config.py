@@ -17,6 +17,11 @@ MAX_RECENT_DBS = 10
 # Storage settings
 STORAGE_DIR = "storage"
 
+# Downscaled copies of large images shown in record previews
+THUMBNAIL_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pycruds", "thumbs")
+PREVIEW_IMAGE_WIDTH = 1200
+PRINT_IMAGE_WIDTH = 2400
+
 # UI settings
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -4,54 +4,187 @@ Handles all SQLite operations and schema management
 """
 import sqlite3
 import json
+import threading
+import itertools
+from contextlib import contextmanager
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import unicodedata
 import config
 
 
+# Maximum number of IDs bound in a single "IN (...)" query; stays below
+# SQLite's default SQLITE_MAX_VARIABLE_NUMBER on older builds (999)
+MAX_IN_PARAMS = 900
+# Maximum number of SELECTs joined in one compound query (SQLITE_MAX_COMPOUND_SELECT)
+MAX_COMPOUND_SELECT = 500
+
+
+# Shortest search term the trigram full-text index can answer; shorter terms use LIKE
+MIN_INDEXED_SEARCH_LENGTH = 3
+
+
+# Records read per query when iterating a whole table (see iter_records)
+ITER_CHUNK_SIZE = 5000
+
+
+# Bytes of the database file each connection reads through a memory map
+MMAP_SIZE = 256 * 1024 * 1024
+# Page cache per connection, in KiB (passed to PRAGMA cache_size as a negative number)
+CACHE_SIZE_KIB = 64 * 1024
+
+# Source of connection generations, unique across all DatabaseManager instances
+_generations = itertools.count(1)
+
+
+# Create custom LOWER function for Unicode support (Greek, etc.)
+def unicode_lower(text):
+    return text.lower() if text else text
+
+
+# Create custom function to remove accents/tonos for Greek text search
+def remove_accents(text):
+    if not text:
+        return text
+    # Normalize to NFD (decomposed form) and remove combining marks
+    nfd = unicodedata.normalize('NFD', text)
+    return ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
+
+
+# Create combined function for case-insensitive, accent-insensitive search
+def normalize_search(text):
+    if not text:
+        return text
+    # First remove accents, then lowercase
+    no_accents = remove_accents(text)
+    return no_accents.lower()
+
+
 class DatabaseManager:
     def __init__(self, db_file: str = config.DB_FILE):
         self.db_file = db_file
-        self.connection = None
-        self.cursor = None
+        # Each thread gets its own connection (sqlite3 connections are not shareable)
+        self._local = threading.local()
+        # Single-record SELECT per table, built once so sqlite3's statement cache reuses it
+        self._stmt_cache = {}
+        # table name -> columns in its full-text search index (None: no index)
+        self._search_index_cache = {}
+        # (table name, column) pairs known to have a (column, id) sort index
+        self._sort_indexes = set()
+        # Table list and table id -> field list for get_cached_tables/get_cached_fields,
+        # dropped by every schema change (see invalidate_schema_cache)
+        self._tables_cache = None
+        self._fields_cache = {}
+        # Bumped by every record insert, update and delete (and each connect), so views can
+        # tell cached data is stale
+        self.write_version = 0
+        # New (and unique in the process) on each connect: thread connections opened before
+        # it are reopened, and anything cached per database can key on (db_file, generation)
+        self.generation = 0
         self.connect()
         self.initialize_schema()
 
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread"""
+        return self.get_thread_connection()
+
+    @property
+    def cursor(self) -> sqlite3.Cursor:
+        """Cursor on the calling thread's connection"""
+        self.get_thread_connection()
+        return self._local.cursor
+
     def connect(self):
         """Establish database connection"""
-        self.connection = sqlite3.connect(self.db_file)
-        self.connection.row_factory = sqlite3.Row
-        self.cursor = self.connection.cursor()
-
-        # Create custom LOWER function for Unicode support (Greek, etc.)
-        def unicode_lower(text):
-            return text.lower() if text else text
-
-        # Create custom function to remove accents/tonos for Greek text search
-        def remove_accents(text):
-            if not text:
-                return text
-            # Normalize to NFD (decomposed form) and remove combining marks
-            nfd = unicodedata.normalize('NFD', text)
-            return ''.join(char for char in nfd if unicodedata.category(char) != 'Mn')
-
-        # Create combined function for case-insensitive, accent-insensitive search
-        def normalize_search(text):
-            if not text:
-                return text
-            # First remove accents, then lowercase
-            no_accents = remove_accents(text)
-            return no_accents.lower()
-
-        self.connection.create_function("UNICODE_LOWER", 1, unicode_lower)
-        self.connection.create_function("REMOVE_ACCENTS", 1, remove_accents)
-        self.connection.create_function("NORMALIZE_SEARCH", 1, normalize_search)
+        # A (re)connect may see different data, e.g. after a backup was restored
+        self.write_version += 1
+        self.generation = next(_generations)
+        self._reset_caches()
+        self._main_connection = self._open_connection()
+        # Write-ahead log: readers don't block the writer and commits append instead of
+        # rewriting pages through a rollback journal (persists in the database file)
+        self._main_connection.execute("PRAGMA journal_mode=WAL")
+        self._local.connection = self._main_connection
+        self._local.cursor = self._main_connection.cursor()
+        self._local.generation = self.generation
+
+    def _reset_caches(self):
+        """Forget everything cached about the database's contents and schema"""
+        self._stmt_cache.clear()
+        self._search_index_cache.clear()
+        self._sort_indexes.clear()
+        self.invalidate_schema_cache()
+
+    def get_thread_connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening one for background threads on first use
+        (and again after a reconnect, which may have replaced the database file)
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'generation', None) != self.generation:
+            connection = self._open_connection()
+            self._local.connection = connection
+            self._local.cursor = connection.cursor()
+            self._local.generation = self.generation
+        return connection
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection with row access by name and the custom search functions"""
+        connection = sqlite3.connect(self.db_file)
+        connection.row_factory = sqlite3.Row
+
+        # Per-connection tuning: with WAL, NORMAL sync only fsyncs at checkpoints
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        connection.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        connection.execute("PRAGMA temp_store=MEMORY")
+
+        connection.create_function("UNICODE_LOWER", 1, unicode_lower)
+        connection.create_function("REMOVE_ACCENTS", 1, remove_accents)
+        connection.create_function("NORMALIZE_SEARCH", 1, normalize_search)
+        return connection
+
+    def _commit(self):
+        """Commit the calling thread's writes, unless they are part of a transaction() block"""
+        if not getattr(self._local, 'transaction_depth', 0):
+            self.connection.commit()
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of writes as one transaction: committed when the block ends,
+        rolled back if it raises. Nested blocks join the outer transaction.
+        """
+        connection = self.connection
+        depth = getattr(self._local, 'transaction_depth', 0)
+        if depth == 0:
+            if connection.in_transaction:
+                connection.commit()
+            connection.execute("BEGIN IMMEDIATE")
+
+        self._local.transaction_depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            self._local.transaction_depth = depth
+            if depth == 0:
+                connection.rollback()
+                # Cached schema may have been read from the rolled back writes
+                self.invalidate_schema_cache()
+            raise
+        self._local.transaction_depth = depth
+        if depth == 0:
+            connection.commit()
 
     def close(self):
         """Close database connection"""
-        if self.connection:
-            self.connection.close()
+        if self._main_connection:
+            # Refresh the query planner's statistics for the indexes this session used
+            try:
+                self._main_connection.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+            self._main_connection.close()
+        self._reset_caches()
 
     def initialize_schema(self):
         """Create the meta-schema tables"""
@@ -87,7 +220,21 @@ class DatabaseManager:
             )
         """)
 
-        self.connection.commit()
+        # Full-text search indexes: which columns each table's <name>_fts index covers
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS _search_indexes (
+                table_name TEXT PRIMARY KEY,
+                columns TEXT NOT NULL
+            )
+        """)
+
+        # Reverse reference lookups (which fields point at a table)
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_fields_reference_table
+            ON _fields (reference_table_id)
+        """)
+
+        self._commit()
 
         # Migration: Add cascade_delete column if it doesn't exist
         try:
@@ -97,7 +244,7 @@ class DatabaseManager:
             self.cursor.execute("""
                 ALTER TABLE _fields ADD COLUMN cascade_delete BOOLEAN DEFAULT 0
             """)
-            self.connection.commit()
+            self._commit()
 
     def create_table(self, name: str, display_name: str) -> int:
         """Create a new CRUD table"""
@@ -117,7 +264,8 @@ class DatabaseManager:
             )
         """)
 
-        self.connection.commit()
+        self.invalidate_schema_cache()
+        self._commit()
         return table_id
 
     def delete_table(self, table_id: int):
@@ -130,8 +278,11 @@ class DatabaseManager:
 
         table_name = row['name']
 
-        # Drop the actual table
+        # Drop the actual table and its search index
         self.cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+        self.cursor.execute(f"DROP TABLE IF EXISTS {table_name}_fts")
+        self.cursor.execute("DELETE FROM _search_indexes WHERE table_name = ?", (table_name,))
+        self._search_index_cache.pop(table_name, None)
 
         # Delete fields metadata
         self.cursor.execute("DELETE FROM _fields WHERE table_id = ?", (table_id,))
@@ -139,13 +290,20 @@ class DatabaseManager:
         # Delete table metadata
         self.cursor.execute("DELETE FROM _tables WHERE id = ?", (table_id,))
 
-        self.connection.commit()
+        self.invalidate_schema_cache()
+        self._commit()
 
     def get_all_tables(self) -> List[Dict[str, Any]]:
         """Get all CRUD tables"""
         self.cursor.execute("SELECT * FROM _tables ORDER BY name")
         return [dict(row) for row in self.cursor.fetchall()]
 
+    def get_cached_tables(self) -> List[Dict[str, Any]]:
+        """get_all_tables, cached until the next schema change (shared: do not modify)"""
+        if self._tables_cache is None:
+            self._tables_cache = self.get_all_tables()
+        return self._tables_cache
+
     def get_table(self, table_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific table"""
         self.cursor.execute("SELECT * FROM _tables WHERE id = ?", (table_id,))
@@ -182,14 +340,16 @@ class DatabaseManager:
             sql_type = self._get_sql_type(field_type)
             self.cursor.execute(f"ALTER TABLE {table['name']} ADD COLUMN {name} {sql_type}")
 
-        self.connection.commit()
+        self.invalidate_schema_cache()
+        self._commit()
 
     def delete_field(self, field_id: int):
         """Delete a field (note: SQLite doesn't support DROP COLUMN easily)"""
         # For now, just delete the metadata
         # In production, you'd need to recreate the table without the column
         self.cursor.execute("DELETE FROM _fields WHERE id = ?", (field_id,))
-        self.connection.commit()
+        self.invalidate_schema_cache()
+        self._commit()
 
     def get_fields(self, table_id: int) -> List[Dict[str, Any]]:
         """Get all fields for a table"""
@@ -200,6 +360,28 @@ class DatabaseManager:
         """, (table_id,))
         return [dict(row) for row in self.cursor.fetchall()]
 
+    def get_cached_fields(self, table_id: int) -> List[Dict[str, Any]]:
+        """get_fields, cached until the next schema change (shared: do not modify)"""
+        if table_id not in self._fields_cache:
+            self._fields_cache[table_id] = self.get_fields(table_id)
+        return self._fields_cache[table_id]
+
+    def invalidate_schema_cache(self):
+        """Drop cached table and field lists; call after writing _tables or _fields directly"""
+        self._tables_cache = None
+        self._fields_cache.clear()
+
+    def get_reference_fields_targeting(self, table_id: int) -> List[Dict[str, Any]]:
+        """Get reference fields (any table) pointing to a table, with their table's name and display name"""
+        self.cursor.execute("""
+            SELECT f.*, t.name AS table_name, t.display_name AS table_display_name
+            FROM _fields f
+            JOIN _tables t ON t.id = f.table_id
+            WHERE f.field_type = 'reference' AND f.reference_table_id = ?
+            ORDER BY t.name, f.position, f.id
+        """, (table_id,))
+        return [dict(row) for row in self.cursor.fetchall()]
+
     def _get_sql_type(self, field_type: str) -> str:
         """Map field type to SQL type"""
         type_mapping = {
@@ -238,7 +420,9 @@ class DatabaseManager:
             )
 
         record_id = self.cursor.lastrowid
-        self.connection.commit()
+        self._index_record(table_name, record_id)
+        self.write_version += 1
+        self._commit()
         return record_id
 
     def update_record(self, table_name: str, record_id: int, data: Dict[str, Any]):
@@ -254,56 +438,59 @@ class DatabaseManager:
             f"UPDATE {table_name} SET {set_clause} WHERE id = ?",
             values
         )
-        self.connection.commit()
+        self._index_record(table_name, record_id)
+        self.write_version += 1
+        self._commit()
+
+    def delete_record(self, table_name: str, record_id: int) -> List[tuple]:
+        """Delete a record and handle cascade deletes, all in one transaction.
+        Returns the (table_name, record_id) of every record deleted.
+        """
+        deleted = {}
+        with self.transaction():
+            self._delete_record(table_name, record_id, deleted)
+        return list(deleted)
+
+    def _delete_record(self, table_name: str, record_id: int, deleted: dict):
+        """Delete a record after the records that cascade from it, collecting them in deleted"""
+        key = (table_name, record_id)
+        if key in deleted:
+            return
+        # Marked before cascading, so reference cycles end here
+        deleted[key] = True
 
-    def delete_record(self, table_name: str, record_id: int):
-        """Delete a record and handle cascade deletes"""
         # Get the table ID
         table = self.cursor.execute("SELECT id FROM _tables WHERE name = ?", (table_name,)).fetchone()
         if not table:
             return
 
-        table_id = table['id']
-
         # Find all reference fields in other tables that point to this table with cascade delete enabled
-        all_tables = self.get_tables()
-
-        for other_table in all_tables:
-            other_table_id = other_table['id']
-            other_table_name = other_table['name']
-
-            # Get fields for this table
-            fields = self.get_fields(other_table_id)
-
-            # Find reference fields pointing to our table with cascade_delete=True
-            for field in fields:
-                if (field['field_type'] == 'reference' and
-                    field.get('reference_table_id') == table_id and
-                    field.get('cascade_delete', False)):
-
-                    # Find records in this table that reference our record
-                    where_clause = f"{field['name']} = ?"
-                    where_params = (record_id,)
-
-                    referencing_records = self.get_records(
-                        other_table_name,
-                        where_clause=where_clause,
-                        where_params=where_params
-                    )
+        for field in self.get_reference_fields_targeting(table['id']):
+            if not field.get('cascade_delete'):
+                continue
+
+            # Find records in this table that reference our record
+            referencing_records = self.get_records(
+                field['table_name'],
+                where_clause=f"{field['name']} = ?",
+                where_params=(record_id,)
+            )
 
-                    # Delete each referencing record (recursively handles their cascade deletes)
-                    for ref_record in referencing_records:
-                        self.delete_record(other_table_name, ref_record['id'])
+            # Delete each referencing record (recursively handles their cascade deletes)
+            for ref_record in referencing_records:
+                self._delete_record(field['table_name'], ref_record['id'], deleted)
 
         # Delete the record itself
         self.cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (record_id,))
-        self.connection.commit()
+        self._index_record(table_name, record_id)
+        self.write_version += 1
 
     def get_records(self, table_name: str, limit: int = None, offset: int = 0,
                    order_by: str = 'id', order_dir: str = 'ASC',
-                   where_clause: str = None, where_params: tuple = None) -> List[Dict[str, Any]]:
-        """Get records from a table"""
-        query = f"SELECT * FROM {table_name}"
+                   where_clause: str = None, where_params: tuple = None,
+                   columns: str = '*') -> List[Dict[str, Any]]:
+        """Get records from a table; columns is the SELECT list"""
+        query = f"SELECT {columns} FROM {table_name}"
         params = []
 
         if where_clause:
@@ -311,20 +498,133 @@ class DatabaseManager:
             if where_params:
                 params.extend(where_params)
 
-        query += f" ORDER BY {order_by} {order_dir}"
+        query += f" ORDER BY {self._order_clause(order_by, order_dir)}"
 
         if limit:
             query += f" LIMIT {limit} OFFSET {offset}"
 
-        self.cursor.execute(query, params)
-        return [dict(row) for row in self.cursor.fetchall()]
+        return self._fetch_records(query, params)
+
+    def _fetch_records(self, query: str, params=()) -> List[Dict[str, Any]]:
+        """Run a SELECT and return its rows as dicts, built straight from plain tuples
+        rather than through an intermediate sqlite3.Row per row
+        """
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        try:
+            cursor.execute(query, params)
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+    def _order_clause(self, order_by: str, order_dir: str) -> str:
+        """ORDER BY terms, with id breaking ties so the order is stable between pages"""
+        if order_by == 'id':
+            return f"id {order_dir}"
+        return f"{order_by} {order_dir}, id {order_dir}"
+
+    def ensure_sort_index(self, table_name: str, column: str):
+        """Create a (column, id) index so sorted pages are read in index order.
+        A schema write: call it from the GUI thread before handing the sort to a worker.
+        """
+        if column == 'id' or (table_name, column) in self._sort_indexes:
+            return
+        self.cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table_name}_{column}_id ON {table_name} ({column}, id)"
+        )
+        self._commit()
+        self._sort_indexes.add((table_name, column))
+
+    def get_records_after(self, table_name: str, after: tuple, limit: int,
+                          order_by: str = 'id', order_dir: str = 'ASC',
+                          columns: str = '*', where_clause: str = None,
+                          where_params: tuple = None) -> List[Dict[str, Any]]:
+        """Get the page of records that follows after = (sort value, id), the last record
+        of the previous page, in the same order as get_records (keyset pagination).
+        Reading from the (order_by, id) index, this costs the same at any depth.
+        """
+        sort_value, last_id = after
+        ascending = order_dir.upper() == 'ASC'
+        cmp = '>' if ascending else '<'
+
+        # The rest of the order as index range conditions, read one after another;
+        # NULLs sort first ascending and last descending
+        if order_by == 'id':
+            segments = [(f"id {cmp} ?", [last_id])]
+        elif sort_value is None:
+            segments = [(f"{order_by} IS NULL AND id {cmp} ?", [last_id])]
+            if ascending:
+                segments.append((f"{order_by} IS NOT NULL", []))
+        else:
+            segments = [(f"({order_by}, id) {cmp} (?, ?)", [sort_value, last_id])]
+            if not ascending:
+                segments.append((f"{order_by} IS NULL", []))
+
+        order_clause = self._order_clause(order_by, order_dir)
+        records = []
+        for segment, params in segments:
+            if where_clause:
+                segment = f"({where_clause}) AND {segment}"
+                params = list(where_params or ()) + params
+            records.extend(self._fetch_records(
+                f"SELECT {columns} FROM {table_name} WHERE {segment} "
+                f"ORDER BY {order_clause} LIMIT {int(limit) - len(records)}",
+                params
+            ))
+            if len(records) >= limit:
+                break
+        return records
 
     def get_record(self, table_name: str, record_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific record"""
-        self.cursor.execute(f"SELECT * FROM {table_name} WHERE id = ?", (record_id,))
+        sql = self._stmt_cache.get(table_name)
+        if sql is None:
+            sql = self._stmt_cache.setdefault(table_name, f"SELECT * FROM {table_name} WHERE id = ?")
+        self.cursor.execute(sql, (record_id,))
         row = self.cursor.fetchone()
         return dict(row) if row else None
 
+    def get_records_bulk(self, table_name: str, record_ids: List[int],
+                         columns: str = '*') -> Dict[int, Dict[str, Any]]:
+        """Get several records by ID with batched IN queries, keyed by record ID.
+        columns is the SELECT list and must include id.
+        """
+        # Drop duplicates while keeping order
+        record_ids = list(dict.fromkeys(record_ids))
+        records = {}
+
+        for start in range(0, len(record_ids), MAX_IN_PARAMS):
+            chunk = record_ids[start:start + MAX_IN_PARAMS]
+            placeholders = ', '.join(['?' for _ in chunk])
+            for record in self._fetch_records(
+                f"SELECT {columns} FROM {table_name} WHERE id IN ({placeholders})",
+                chunk
+            ):
+                records[record['id']] = record
+
+        return records
+
+    def get_referencing_records(self, sources: List[tuple], record_id: int) -> List[Dict[str, Any]]:
+        """Get records that reference record_id, over several (table_name, field_name, columns)
+        sources in one UNION ALL query. Rows carry __source, the index of their source,
+        and come back ordered by source, then record ID.
+        """
+        records = []
+
+        for start in range(0, len(sources), MAX_COMPOUND_SELECT):
+            chunk = sources[start:start + MAX_COMPOUND_SELECT]
+            selects = [
+                f"SELECT {start + i} AS __source, {columns} FROM {table_name} WHERE {field_name} = ?"
+                for i, (table_name, field_name, columns) in enumerate(chunk)
+            ]
+            records.extend(self._fetch_records(
+                " UNION ALL ".join(selects) + " ORDER BY __source, id",
+                [record_id] * len(chunk)
+            ))
+
+        return records
+
     def count_records(self, table_name: str, where_clause: str = None,
                      where_params: tuple = None) -> int:
         """Count records in a table"""
@@ -339,24 +639,171 @@ class DatabaseManager:
         self.cursor.execute(query, params)
         return self.cursor.fetchone()['count']
 
-    def search_records(self, table_name: str, fields: List[str],
-                      search_term: str) -> List[Dict[str, Any]]:
-        """Search records across multiple fields (case-insensitive, accent-insensitive with Unicode support)"""
-        if not fields or not search_term:
-            return self.get_records(table_name)
+    def aggregate_numbers(self, table_name: str, columns: List[str]) -> tuple:
+        """Summarise numeric columns in one pass over the table.
+        Returns (record count, {column: (count, sum, average, min, max)}); values that are
+        not numbers are skipped, and a column without any has a count of 0 and None elsewhere.
+        """
+        select = ['COUNT(*)']
+        for column in columns:
+            value = f"(CASE WHEN typeof({column}) IN ('integer', 'real') THEN {column} END)"
+            select.extend([f"COUNT({value})", f"TOTAL({value})", f"AVG({value})",
+                           f"MIN({value})", f"MAX({value})"])
+
+        self.cursor.execute(f"SELECT {', '.join(select)} FROM {table_name}")
+        row = tuple(self.cursor.fetchone())
+        stats = {}
+        for i, column in enumerate(columns):
+            count, total, avg, min_val, max_val = row[1 + 5 * i:6 + 5 * i]
+            stats[column] = (count, total if count else None, avg, min_val, max_val)
+        return row[0], stats
+
+    def get_search_index_columns(self, table_name: str, refresh: bool = False) -> Optional[List[str]]:
+        """Columns covered by a table's full-text search index, or None if it has none.
+        With refresh, re-read from the database rather than trusting the cache.
+        """
+        if refresh or table_name not in self._search_index_cache:
+            self.cursor.execute("SELECT columns FROM _search_indexes WHERE table_name = ?", (table_name,))
+            row = self.cursor.fetchone()
+            self._search_index_cache[table_name] = json.loads(row['columns']) if row else None
+        return self._search_index_cache[table_name]
+
+    def _search_body(self, columns: List[str]) -> str:
+        """SQL expression for the normalized text indexed for a record"""
+        # A line break between values keeps matches from spanning two fields
+        joined = " || char(10) || ".join(f"COALESCE({column}, '')" for column in columns)
+        return f"NORMALIZE_SEARCH({joined})"
+
+    def ensure_search_index(self, table_name: str, fields: List[str]) -> bool:
+        """(Re)build a table's FTS5 trigram index if it does not cover exactly fields.
+        Returns False when this SQLite build has no FTS5/trigram support.
+        A schema write and possibly a full reindex, so it is run on a worker when a table's
+        fields are loaded (see sync_search_index), never from a search; searches use the
+        LIKE scan until _search_indexes lists the new columns.
+        """
+        if self.get_search_index_columns(table_name) == list(fields):
+            return True
+
+        # Holds the write lock for the whole rebuild; re-checked inside, as another thread
+        # may have built the same index while this one waited for the lock
+        with self.transaction():
+            if self.get_search_index_columns(table_name, refresh=True) == list(fields):
+                return True
+
+            try:
+                self.cursor.execute(f"DROP TABLE IF EXISTS {table_name}_fts")
+                self.cursor.execute(
+                    f"CREATE VIRTUAL TABLE {table_name}_fts USING fts5(body, tokenize='trigram')"
+                )
+            except sqlite3.OperationalError:
+                return False
 
-        where_parts = [f"NORMALIZE_SEARCH({field}) LIKE NORMALIZE_SEARCH(?)" for field in fields]
-        where_clause = ' OR '.join(where_parts)
-        where_params = tuple([f"%{search_term}%" for _ in fields])
+            self.cursor.execute(
+                f"INSERT INTO {table_name}_fts (rowid, body) "
+                f"SELECT id, {self._search_body(fields)} FROM {table_name}"
+            )
+            self.cursor.execute(
+                "INSERT OR REPLACE INTO _search_indexes (table_name, columns) VALUES (?, ?)",
+                (table_name, json.dumps(list(fields)))
+            )
+        self._search_index_cache[table_name] = list(fields)
+        return True
 
-        return self.get_records(table_name, where_clause=where_clause,
-                               where_params=where_params)
+    def drop_search_index(self, table_name: str):
+        """Remove a table's full-text search index, so writes stop maintaining it"""
+        if self.get_search_index_columns(table_name, refresh=True) is None:
+            return
+        with self.transaction():
+            self.cursor.execute(f"DROP TABLE IF EXISTS {table_name}_fts")
+            self.cursor.execute("DELETE FROM _search_indexes WHERE table_name = ?", (table_name,))
+        self._search_index_cache[table_name] = None
+
+    def sync_search_index(self, table_name: str, fields: List[str]) -> bool:
+        """Make a table's search index cover exactly fields, dropping it when there are none.
+        Meant for a worker thread (see ensure_search_index).
+        """
+        if not fields:
+            self.drop_search_index(table_name)
+            return False
+        return self.ensure_search_index(table_name, fields)
+
+    def _index_record(self, table_name: str, record_id: int):
+        """Bring a record's search index entry up to date (no-op for tables without an index)"""
+        # Read from the database: the write must not follow a cached index that is gone
+        columns = self.get_search_index_columns(table_name, refresh=True)
+        if not columns:
+            return
 
-    def filter_records(self, table_name: str, filters: dict) -> List[Dict[str, Any]]:
-        """Filter records based on advanced filter criteria"""
-        if not filters:
-            return self.get_records(table_name)
+        self.cursor.execute(f"DELETE FROM {table_name}_fts WHERE rowid = ?", (record_id,))
+        self.cursor.execute(
+            f"INSERT INTO {table_name}_fts (rowid, body) "
+            f"SELECT id, {self._search_body(columns)} FROM {table_name} WHERE id = ?",
+            (record_id,)
+        )
+
+    def _search_where(self, table_name: str, fields: List[str], search_term: str) -> tuple:
+        """WHERE clause and params matching search_term in any of fields"""
+        # Substring match through the trigram index when the term is long enough and the
+        # index covers exactly these fields (it is built by ensure_search_index; searching
+        # only reads, as it may run on a worker thread)
+        if (len(search_term) >= MIN_INDEXED_SEARCH_LENGTH
+                and self.get_search_index_columns(table_name) == list(fields)):
+            phrase = '"' + normalize_search(search_term).replace('"', '""') + '"'
+            return f"id IN (SELECT rowid FROM {table_name}_fts WHERE {table_name}_fts MATCH ?)", (phrase,)
+
+        # Short terms scan: normalize the pattern once here rather than per row and field,
+        # and skip empty columns before calling into Python
+        pattern = f"%{normalize_search(search_term)}%"
+        where_parts = [f"({field} IS NOT NULL AND NORMALIZE_SEARCH({field}) LIKE ?)" for field in fields]
+        where_clause = ' OR '.join(where_parts)
+        where_params = tuple([pattern for _ in fields])
+        return where_clause, where_params
 
+    def search_records(self, table_name: str, fields: List[str],
+                      search_term: str, limit: int = None, offset: int = 0,
+                      order_by: str = 'id', order_dir: str = 'ASC',
+                      columns: str = '*', after: tuple = None) -> List[Dict[str, Any]]:
+        """Search records across multiple fields (case-insensitive, accent-insensitive with Unicode support).
+        With after (see get_records_after) the page is read by keyset instead of offset.
+        """
+        where_clause, where_params = None, None
+        if fields and search_term:
+            where_clause, where_params = self._search_where(table_name, fields, search_term)
+        return self._get_page(table_name, where_clause, where_params, limit, offset,
+                              order_by, order_dir, columns, after)
+
+    def _get_page(self, table_name: str, where_clause: str, where_params: tuple, limit: int,
+                  offset: int, order_by: str, order_dir: str, columns: str, after: tuple) -> List[Dict[str, Any]]:
+        """A page of matching records, by keyset when after is given, otherwise by offset"""
+        if after is not None and limit:
+            return self.get_records_after(table_name, after, limit, order_by=order_by,
+                                          order_dir=order_dir, columns=columns,
+                                          where_clause=where_clause, where_params=where_params)
+        return self.get_records(table_name, limit=limit, offset=offset,
+                               order_by=order_by, order_dir=order_dir,
+                               where_clause=where_clause, where_params=where_params,
+                               columns=columns)
+
+    def count_search_records(self, table_name: str, fields: List[str], search_term: str) -> int:
+        """Count the records search_records would return without a limit"""
+        if not fields or not search_term:
+            return self.count_records(table_name)
+
+        where_clause, where_params = self._search_where(table_name, fields, search_term)
+        return self.count_records(table_name, where_clause=where_clause, where_params=where_params)
+
+    def filter_records(self, table_name: str, filters: dict, limit: int = None, offset: int = 0,
+                       order_by: str = 'id', order_dir: str = 'ASC', columns: str = '*',
+                       after: tuple = None) -> List[Dict[str, Any]]:
+        """Filter records based on advanced filter criteria, optionally one page of them
+        (by offset, or by keyset with after; see get_records_after)
+        """
+        where_clause, where_params = self._filter_where(filters) if filters else (None, None)
+        return self._get_page(table_name, where_clause, where_params, limit, offset,
+                              order_by, order_dir, columns, after)
+
+    def _filter_where(self, filters: dict) -> tuple:
+        """WHERE clause and parameters matching the advanced filter criteria"""
         where_parts = []
         where_params = []
 
@@ -433,6 +880,46 @@ class DatabaseManager:
 
         where_clause = ' AND '.join(where_parts) if where_parts else None
         where_params_tuple = tuple(where_params) if where_params else None
+        return where_clause, where_params_tuple
+
+    def count_filtered_records(self, table_name: str, filters: dict) -> int:
+        """Count the records filter_records would return"""
+        where_clause, where_params = self._filter_where(filters) if filters else (None, None)
+        return self.count_records(table_name, where_clause=where_clause, where_params=where_params)
+
+    def iter_records(self, table_name: str, where_clause: str = None, where_params: tuple = None,
+                     chunk_size: int = ITER_CHUNK_SIZE, order_by: str = 'id', order_dir: str = 'ASC'):
+        """Yield a table's records in (order_by, id) order as lists of up to chunk_size,
+        reading one chunk at a time (keyset, see get_records_after), so whole-table passes
+        use constant memory
+        """
+        after = None
+        while True:
+            if after is None:
+                chunk = self.get_records(table_name, limit=chunk_size, order_by=order_by,
+                                         order_dir=order_dir, where_clause=where_clause,
+                                         where_params=where_params)
+            else:
+                chunk = self.get_records_after(table_name, after, chunk_size, order_by, order_dir,
+                                               where_clause=where_clause, where_params=where_params)
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last = chunk[-1]
+            after = (last.get(order_by), last['id'])
+
+    def iter_search_records(self, table_name: str, fields: List[str], search_term: str,
+                            chunk_size: int = ITER_CHUNK_SIZE):
+        """iter_records over the records search_records would return"""
+        if not fields or not search_term:
+            return self.iter_records(table_name, chunk_size=chunk_size)
+
+        where_clause, where_params = self._search_where(table_name, fields, search_term)
+        return self.iter_records(table_name, where_clause, where_params, chunk_size)
 
-        return self.get_records(table_name, where_clause=where_clause,
-                               where_params=where_params_tuple)
+    def iter_filtered_records(self, table_name: str, filters: dict, chunk_size: int = ITER_CHUNK_SIZE):
+        """iter_records over the records filter_records would return"""
+        where_clause, where_params = self._filter_where(filters) if filters else (None, None)
+        return self.iter_records(table_name, where_clause, where_params, chunk_size)
@@ -0,0 +1,16 @@
+"""
+JSON helpers that use orjson when it is installed, else the standard library
+"""
+import json
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj) -> str:
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    loads = json.loads
+    dumps = json.dumps
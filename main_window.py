@@ -14,6 +14,7 @@ from database import DatabaseManager
 from storage import StorageManager
 from export_import import DataExporter, DataImporter
 from backup import BackupManager
+from report_viewer import clear_report_cache
 
 
 class MainWindow(QMainWindow):
@@ -469,6 +470,7 @@ class MainWindow(QMainWindow):
         try:
             # Close current connection
             self.db.close()
+            clear_report_cache()
 
             if self.backup_manager.restore_backup(file_path):
                 # Reconnect to database
@@ -543,6 +545,7 @@ class MainWindow(QMainWindow):
             # Close current database if open
             if self.db:
                 self.db.close()
+                clear_report_cache()
 
             # Open new database
             self.current_db_path = db_path
@@ -7,15 +7,47 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                              QComboBox, QDateEdit, QFileDialog, QListWidget,
                              QSpinBox, QDoubleSpinBox, QGroupBox, QListWidgetItem,
                              QSizePolicy)
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer
 from PyQt6.QtGui import QPixmap, QImage
 from database import DatabaseManager
 from storage import StorageManager
+from dataclasses import dataclass
 from datetime import datetime
-import json
+import fast_json
 import os
 
 
+# Number of fields whose widgets are built up front; the rest are created
+# on demand as they are scrolled into view
+INITIAL_FIELD_COUNT = 10
+
+# Estimated heights for placeholders standing in for not-yet-built widgets
+PLACEHOLDER_HEIGHTS = {
+    'richtext': 150,
+    'multiselect': 150,
+    'multireference': 150,
+    'image': 235
+}
+DEFAULT_PLACEHOLDER_HEIGHT = 30
+
+# Field type groups shared by the load/read/save paths
+_TEXT_LIKE = frozenset({'text', 'email', 'url', 'phone'})
+_FILE_LIKE = frozenset({'image', 'file'})
+
+
+@dataclass
+class FieldEntry:
+    """A form field with its frequently used metadata pulled out of the field dict"""
+    __slots__ = ('name', 'field_type', 'is_required', 'field', 'widget', 'placeholder')
+
+    name: str
+    field_type: str
+    is_required: bool
+    field: dict
+    widget: QWidget
+    placeholder: QWidget
+
+
 class RecordDialog(QDialog):
     def __init__(self, db: DatabaseManager, storage: StorageManager,
                  table_id: int, table_name: str, fields: list,
@@ -29,6 +61,10 @@ class RecordDialog(QDialog):
         self.record_id = record_id
         self.is_edit_mode = record_id is not None
         self.field_widgets = {}
+        self.record = None
+        # Referenced tables' records and fields, shared by all reference widgets
+        self._records_by_ref_table = {}
+        self._fields_by_ref_table = {}
 
         self.setWindowTitle(f"Edit Record #{record_id}" if self.is_edit_mode else "New Record")
         self.resize(600, 700)
@@ -49,6 +85,7 @@ class RecordDialog(QDialog):
         scroll.setWidgetResizable(True)
         scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         layout.addWidget(scroll)
+        self.scroll = scroll
 
         # Form widget
         form_widget = QWidget()
@@ -59,13 +96,25 @@ class RecordDialog(QDialog):
         self.form_layout.setSpacing(0)
         self.form_layout.setContentsMargins(15, 15, 15, 15)
 
-        # Create form fields
-        for field in self.fields:
-            widget = self.create_field_widget(field)
-            self.field_widgets[field['name']] = {
-                'field': field,
-                'widget': widget
-            }
+        # Create form fields (widgets past the first screen start as placeholders)
+        for index, field in enumerate(self.fields):
+            if index < INITIAL_FIELD_COUNT:
+                widget = self.create_field_widget(field)
+                placeholder = None
+            else:
+                widget = None
+                placeholder = QWidget()
+                placeholder.setFixedHeight(
+                    PLACEHOLDER_HEIGHTS.get(field['field_type'], DEFAULT_PLACEHOLDER_HEIGHT)
+                )
+            self.field_widgets[field['name']] = FieldEntry(
+                name=field['name'],
+                field_type=field['field_type'],
+                is_required=bool(field['is_required']),
+                field=field,
+                widget=widget,
+                placeholder=placeholder
+            )
 
             label_text = field['display_name']
             if field['is_required']:
@@ -76,7 +125,7 @@ class RecordDialog(QDialog):
 
             # Add label and widget directly to form
             self.form_layout.addWidget(label)
-            self.form_layout.addWidget(widget)
+            self.form_layout.addWidget(widget or placeholder)
 
             # Add spacing after each field group
             self.form_layout.addSpacing(12)
@@ -84,6 +133,15 @@ class RecordDialog(QDialog):
         # Add stretch at the end to push all fields to the top
         self.form_layout.addStretch()
 
+        # Build placeholder widgets once they scroll (or resize) into view. The check
+        # runs from a zero-interval timer so the form has been laid out by then.
+        self.realize_timer = QTimer(self)
+        self.realize_timer.setSingleShot(True)
+        self.realize_timer.setInterval(0)
+        self.realize_timer.timeout.connect(self.realize_visible_fields)
+        scroll.verticalScrollBar().valueChanged.connect(lambda: self.realize_timer.start())
+        scroll.verticalScrollBar().rangeChanged.connect(lambda: self.realize_timer.start())
+
         # Buttons
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(5)
@@ -101,6 +159,36 @@ class RecordDialog(QDialog):
 
         layout.addLayout(btn_layout)
 
+    def realize_visible_fields(self):
+        """Build widgets for placeholder fields within (or just below) the viewport"""
+        top = self.scroll.verticalScrollBar().value()
+        # Look one screen ahead so widgets are ready before they scroll in
+        bottom = top + self.scroll.viewport().height() * 2
+
+        for field_name, entry in self.field_widgets.items():
+            placeholder = entry.placeholder
+            if placeholder is None:
+                continue
+            if placeholder.y() > bottom:
+                # Fields are laid out in order, so the rest are further down
+                break
+            if placeholder.y() + placeholder.height() >= top:
+                self._realize_field(field_name)
+
+    def _realize_field(self, field_name: str) -> QWidget:
+        """Return the widget for a field, building it in place of its placeholder if needed"""
+        entry = self.field_widgets[field_name]
+        if entry.widget is None:
+            entry.widget = self.create_field_widget(entry.field)
+            self.form_layout.replaceWidget(entry.placeholder, entry.widget)
+            entry.placeholder.deleteLater()
+            entry.placeholder = None
+
+            # Apply the loaded record value that was deferred while unbuilt
+            if self.record is not None:
+                self.set_field_value(entry, self.record.get(field_name))
+        return entry.widget
+
     def get_record_display_name(self, record: dict, table_id: int, display_field_name: str = None) -> str:
         """Get a meaningful display name for a record"""
         # If a specific display field is specified, use that
@@ -110,7 +198,7 @@ class RecordDialog(QDialog):
                 return str(value)
 
         # Get fields for the referenced table
-        ref_fields = self.db.get_fields(table_id)
+        ref_fields = self.get_reference_fields(table_id)
 
         # Try to find a good display field (text, email, or first string field)
         for ref_field in ref_fields:
@@ -122,7 +210,7 @@ class RecordDialog(QDialog):
                 continue
 
             # Prioritize text-like fields
-            if field_type in ['text', 'email', 'phone', 'url']:
+            if field_type in _TEXT_LIKE:
                 value = record.get(field_name)
                 if value:
                     return str(value)
@@ -138,6 +226,20 @@ class RecordDialog(QDialog):
         # Fallback to ID
         return f"ID: {record['id']}"
 
+    def get_reference_fields(self, table_id: int) -> list:
+        """Get (and cache) the fields of a referenced table"""
+        if table_id not in self._fields_by_ref_table:
+            self._fields_by_ref_table[table_id] = self.db.get_fields(table_id)
+        return self._fields_by_ref_table[table_id]
+
+    def get_reference_records(self, table_id: int) -> list:
+        """Get (and cache) the selectable records of a referenced table"""
+        if table_id not in self._records_by_ref_table:
+            ref_table = self.db.get_table(table_id)
+            records = self.db.get_records(ref_table['name'], limit=1000) if ref_table else []
+            self._records_by_ref_table[table_id] = records
+        return self._records_by_ref_table[table_id]
+
     def create_field_widget(self, field: dict) -> QWidget:
         """Create appropriate widget for field type"""
         field_type = field['field_type']
@@ -192,7 +294,7 @@ class RecordDialog(QDialog):
             widget.addItem("-- Select --", None)
             if field.get('options'):
                 try:
-                    options = json.loads(field['options'])
+                    options = fast_json.loads(field['options'])
                     for option in options:
                         widget.addItem(option, option)
                 except:
@@ -205,7 +307,7 @@ class RecordDialog(QDialog):
             widget.setMaximumHeight(150)
             if field.get('options'):
                 try:
-                    options = json.loads(field['options'])
+                    options = fast_json.loads(field['options'])
                     for option in options:
                         item = QListWidgetItem(option)
                         widget.addItem(item)
@@ -225,13 +327,11 @@ class RecordDialog(QDialog):
 
             # Load referenced table records
             if field.get('reference_table_id'):
-                ref_table = self.db.get_table(field['reference_table_id'])
-                if ref_table:
-                    records = self.db.get_records(ref_table['name'], limit=1000)
-                    display_field = field.get('reference_display_field')
-                    for record in records:
-                        display_name = self.get_record_display_name(record, field['reference_table_id'], display_field)
-                        widget.addItem(display_name, record['id'])
+                records = self.get_reference_records(field['reference_table_id'])
+                display_field = field.get('reference_display_field')
+                for record in records:
+                    display_name = self.get_record_display_name(record, field['reference_table_id'], display_field)
+                    widget.addItem(display_name, record['id'])
             return widget
 
         elif field_type == 'multireference':
@@ -241,15 +341,13 @@ class RecordDialog(QDialog):
 
             # Load referenced table records
             if field.get('reference_table_id'):
-                ref_table = self.db.get_table(field['reference_table_id'])
-                if ref_table:
-                    records = self.db.get_records(ref_table['name'], limit=1000)
-                    display_field = field.get('reference_display_field')
-                    for record in records:
-                        display_name = self.get_record_display_name(record, field['reference_table_id'], display_field)
-                        item = QListWidgetItem(display_name)
-                        item.setData(Qt.ItemDataRole.UserRole, record['id'])
-                        widget.addItem(item)
+                records = self.get_reference_records(field['reference_table_id'])
+                display_field = field.get('reference_display_field')
+                for record in records:
+                    display_name = self.get_record_display_name(record, field['reference_table_id'], display_field)
+                    item = QListWidgetItem(display_name)
+                    item.setData(Qt.ItemDataRole.UserRole, record['id'])
+                    widget.addItem(item)
             return widget
 
         else:
@@ -262,96 +360,130 @@ class RecordDialog(QDialog):
         if not record:
             return
 
-        for field_name, field_data in self.field_widgets.items():
-            field = field_data['field']
-            widget = field_data['widget']
-            value = record.get(field_name)
+        self.record = record
 
-            if value is None:
-                continue
+        # Widgets that are not built yet pick up their value in _realize_field
+        for field_name, entry in self.field_widgets.items():
+            if entry.widget is not None:
+                self.set_field_value(entry, record.get(field_name))
 
-            field_type = field['field_type']
+    def set_field_value(self, entry: FieldEntry, value):
+        """Load a stored value into a field widget"""
+        if value is None:
+            return
 
-            if field_type == 'text' or field_type == 'email' or field_type == 'url' or field_type == 'phone':
-                widget.setText(str(value))
+        field_type = entry.field_type
+        widget = entry.widget
 
-            elif field_type == 'number':
-                widget.setValue(float(value) if value else 0)
+        if field_type in _TEXT_LIKE:
+            widget.setText(str(value))
 
-            elif field_type == 'date':
-                try:
-                    date = QDate.fromString(str(value), "yyyy-MM-dd")
-                    widget.setDate(date)
-                except:
-                    pass
+        elif field_type == 'number':
+            widget.setValue(float(value) if value else 0)
 
-            elif field_type == 'boolean':
-                widget.setChecked(bool(value))
+        elif field_type == 'date':
+            try:
+                date = QDate.fromString(str(value), "yyyy-MM-dd")
+                widget.setDate(date)
+            except:
+                pass
 
-            elif field_type == 'richtext':
-                widget.setText(str(value))
+        elif field_type == 'boolean':
+            widget.setChecked(bool(value))
 
-            elif field_type == 'dropdown':
-                index = widget.findData(value)
-                if index >= 0:
-                    widget.setCurrentIndex(index)
+        elif field_type == 'richtext':
+            widget.setText(str(value))
 
-            elif field_type == 'multiselect':
-                try:
-                    selected = json.loads(value) if isinstance(value, str) else value
-                    if selected:
-                        for i in range(widget.count()):
-                            item = widget.item(i)
-                            if item.text() in selected:
-                                item.setSelected(True)
-                except:
-                    pass
+        elif field_type == 'dropdown':
+            index = widget.findData(value)
+            if index >= 0:
+                widget.setCurrentIndex(index)
 
-            elif field_type == 'image' or field_type == 'file':
-                widget.set_file(value, self.record_id)
+        elif field_type == 'multiselect':
+            try:
+                selected = fast_json.loads(value) if isinstance(value, str) else value
+                if selected:
+                    for i in range(widget.count()):
+                        item = widget.item(i)
+                        if item.text() in selected:
+                            item.setSelected(True)
+            except:
+                pass
+
+        elif field_type in _FILE_LIKE:
+            widget.set_file(value, self.record_id)
 
-            elif field_type == 'reference':
-                index = widget.findData(value)
-                if index >= 0:
-                    widget.setCurrentIndex(index)
+        elif field_type == 'reference':
+            index = widget.findData(value)
+            if index >= 0:
+                widget.setCurrentIndex(index)
 
-            elif field_type == 'multireference':
-                try:
-                    selected_ids = json.loads(value) if isinstance(value, str) else value
-                    if selected_ids:
-                        for i in range(widget.count()):
-                            item = widget.item(i)
-                            item_id = item.data(Qt.ItemDataRole.UserRole)
-                            if item_id in selected_ids:
-                                item.setSelected(True)
-                except:
-                    pass
+        elif field_type == 'multireference':
+            try:
+                selected_ids = fast_json.loads(value) if isinstance(value, str) else value
+                if selected_ids:
+                    for i in range(widget.count()):
+                        item = widget.item(i)
+                        item_id = item.data(Qt.ItemDataRole.UserRole)
+                        if item_id in selected_ids:
+                            item.setSelected(True)
+            except:
+                pass
 
     def validate_record(self) -> bool:
         """Validate the form data"""
-        for field_name, field_data in self.field_widgets.items():
-            field = field_data['field']
-            widget = field_data['widget']
+        for entry in self.field_widgets.values():
+            if not entry.is_required:
+                continue
 
-            if field['is_required']:
-                field_type = field['field_type']
-                value = self.get_field_value(field, widget)
+            if self.is_field_empty(entry):
+                QMessageBox.warning(
+                    self,
+                    "Validation Error",
+                    f"{entry.field['display_name']} is required"
+                )
+                return False
+
+        return True
+
+    def is_field_empty(self, entry: FieldEntry) -> bool:
+        """Check whether a field has no value, without building its saved representation"""
+        widget = entry.widget
+        if widget is None:
+            widget = self._realize_field(entry.name)
+
+        field_type = entry.field_type
+
+        if field_type in _TEXT_LIKE:
+            return not widget.text().strip()
+
+        elif field_type in ('number', 'date', 'boolean'):
+            # These widgets always hold a value
+            return False
+
+        elif field_type == 'richtext':
+            return not widget.toPlainText().strip()
+
+        elif field_type in ('dropdown', 'reference'):
+            return widget.currentData() in (None, '')
 
-                if value is None or value == '' or value == []:
-                    QMessageBox.warning(
-                        self,
-                        "Validation Error",
-                        f"{field['display_name']} is required"
-                    )
-                    return False
+        elif field_type in ('multiselect', 'multireference'):
+            return not widget.selectedItems()
+
+        elif field_type in _FILE_LIKE:
+            return not widget.get_value()
 
         return True
 
-    def get_field_value(self, field: dict, widget: QWidget):
+    def get_field_value(self, entry: FieldEntry):
         """Extract value from widget based on field type"""
-        field_type = field['field_type']
+        widget = entry.widget
+        if widget is None:
+            widget = self._realize_field(entry.name)
 
-        if field_type in ['text', 'email', 'url', 'phone']:
+        field_type = entry.field_type
+
+        if field_type in _TEXT_LIKE:
             return widget.text().strip()
 
         elif field_type == 'number':
@@ -373,9 +505,9 @@ class RecordDialog(QDialog):
             selected = []
             for item in widget.selectedItems():
                 selected.append(item.text())
-            return json.dumps(selected) if selected else None
+            return fast_json.dumps(selected) if selected else None
 
-        elif field_type == 'image' or field_type == 'file':
+        elif field_type in _FILE_LIKE:
             return widget.get_value()
 
         elif field_type == 'reference':
@@ -385,7 +517,7 @@ class RecordDialog(QDialog):
             selected = []
             for item in widget.selectedItems():
                 selected.append(item.data(Qt.ItemDataRole.UserRole))
-            return json.dumps(selected) if selected else None
+            return fast_json.dumps(selected) if selected else None
 
         return None
 
@@ -395,50 +527,39 @@ class RecordDialog(QDialog):
             return
 
         try:
-            # Collect data
+            # Collect data and remember file/image widgets in a single pass
             data = {}
-            for field_name, field_data in self.field_widgets.items():
-                field = field_data['field']
-                widget = field_data['widget']
-                value = self.get_field_value(field, widget)
+            file_widgets = []
+            for field_name, entry in self.field_widgets.items():
+                value = self.get_field_value(entry)
 
                 if value is not None:
                     data[field_name] = value
 
-            if self.is_edit_mode:
-                # Update existing record
-                self.db.update_record(self.table_name, self.record_id, data)
-
-                # Handle file uploads and update DB with new paths (if any)
-                updated_paths = {}
-                for field_name, field_data in self.field_widgets.items():
-                    field = field_data['field']
-                    widget = field_data['widget']
-
-                    if field['field_type'] in ['image', 'file']:
-                        # Save and compare against the value we just sent to DB
-                        previous_value = data.get(field_name)
-                        saved_path = widget.save_file(self.record_id, field_name)
-                        if saved_path and saved_path != previous_value:
-                            updated_paths[field_name] = saved_path
-
-                if updated_paths:
-                    self.db.update_record(self.table_name, self.record_id, updated_paths)
+                if entry.field_type in _FILE_LIKE:
+                    # get_field_value has built the widget if it was still a placeholder
+                    file_widgets.append((field_name, entry.widget))
 
+            if self.is_edit_mode:
+                record_id = self.record_id
             else:
-                # Insert new record
+                # Insert new record first so uploads can be stored under its ID
                 record_id = self.db.insert_record(self.table_name, data)
 
-                # Handle file uploads
-                for field_name, field_data in self.field_widgets.items():
-                    field = field_data['field']
-                    widget = field_data['widget']
+            # Handle file uploads
+            file_paths = {}
+            for field_name, widget in file_widgets:
+                saved_path = widget.save_file(record_id, field_name)
+                if saved_path:
+                    file_paths[field_name] = saved_path
 
-                    if field['field_type'] in ['image', 'file']:
-                        file_path = widget.save_file(record_id, field_name)
-                        if file_path:
-                            # Update record with file path
-                            self.db.update_record(self.table_name, record_id, {field_name: file_path})
+            if self.is_edit_mode:
+                # Update existing record, including any new file paths, in one write
+                data.update(file_paths)
+                self.db.update_record(self.table_name, record_id, data)
+            elif file_paths:
+                # Update the new record with its file paths
+                self.db.update_record(self.table_name, record_id, file_paths)
 
             self.accept()
 
@@ -495,31 +616,30 @@ class ImageFieldWidget(QWidget):
             self.file_path = file_path
             self.show_preview(file_path)
 
-    def show_preview(self, file_path: str):
-        """Show image preview"""
-        print(f"[show_preview] Attempting to load image from: {file_path}")
-        print(f"[show_preview] File exists: {os.path.exists(file_path)}")
-
-        if os.path.exists(file_path):
-            # Check file permissions
-            import stat
-            st = os.stat(file_path)
-            print(f"[show_preview] File permissions: {oct(st.st_mode)}")
-            print(f"[show_preview] File size: {st.st_size} bytes")
-
-        pixmap = QPixmap(file_path)
-        print(f"[show_preview] QPixmap loaded, isNull: {pixmap.isNull()}")
-
-        if not pixmap.isNull():
-            scaled = pixmap.scaled(
-                self.preview_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-            self.preview_label.setPixmap(scaled)
-            print(f"[show_preview] Image displayed successfully")
-        else:
-            print(f"[show_preview] ERROR: QPixmap is null, cannot display image")
+    def show_preview(self, file_path: str) -> bool:
+        """Show image preview; returns False if the file could not be read or decoded"""
+        # Read the file once and decode from memory rather than stat-ing it first
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.preview_label.clear()
+            self.preview_label.setText("Image not found")
+            return False
+
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            self.preview_label.clear()
+            self.preview_label.setText("Invalid image")
+            return False
+
+        scaled = pixmap.scaled(
+            self.preview_label.size(),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+        self.preview_label.setPixmap(scaled)
+        return True
 
     def clear_image(self):
         """Clear the image"""
@@ -536,12 +656,8 @@ class ImageFieldWidget(QWidget):
         if value:
             # Support both relative storage paths and absolute paths
             abs_path = value if os.path.isabs(value) else self.storage.get_file_path(value)
-            if os.path.exists(abs_path):
-                self.show_preview(abs_path)
-            else:
+            if not self.show_preview(abs_path):
                 # Debug: File not found
-                self.preview_label.clear()
-                self.preview_label.setText("Image not found")
                 print(f"Image file not found: {abs_path}")
                 print(f"Looking for relative path: {value}")
                 print(f"Storage base dir: {self.storage.base_dir}")
@@ -2,15 +2,164 @@
 Record preview dialog with print functionality
 """
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QTextEdit, QLabel, QMessageBox, QTabWidget,
+                             QTextBrowser, QLabel, QMessageBox, QTabWidget,
                              QTableWidget, QTableWidgetItem, QWidget)
-from PyQt6.QtCore import Qt, QUrl, QMarginsF
-from PyQt6.QtGui import QTextDocument, QFont, QPageLayout, QPageSize
+from PyQt6.QtCore import Qt, QUrl, QMarginsF, QThreadPool
+from PyQt6.QtGui import (QTextDocument, QFontDatabase, QPageLayout, QPageSize, QImageReader,
+                         QTextOption)
 from PyQt6.QtPrintSupport import QPrintDialog, QPrinter
 from database import DatabaseManager
 from storage import StorageManager
-import json
+from workers import Worker
+from io import StringIO
+from string import Template
+from typing import Optional
+import fast_json
+import hashlib
+import html
 import os
+import config
+
+
+# Single-pass translation tables for rendering plain values as HTML
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '\n': '<br>'})
+# Rich text may carry markup, so only line breaks are translated
+_LINE_BREAK_TABLE = str.maketrans({'\n': '<br>'})
+
+# Longest text rendered inline; QTextDocument layout degrades badly on huge values
+_MAX_INLINE_CHARS = 65536
+# Longest HTML entity a truncated rich text value may end inside of (e.g. &thetasym;)
+_MAX_ENTITY_CHARS = 10
+
+# Field types preferred when picking a referenced record's display name
+_DISPLAY_FIELD_TYPES = frozenset({'text', 'email', 'phone', 'url'})
+# Columns every CRUD table has besides its user-defined fields
+_META_COLUMNS = frozenset({'id', 'created_at', 'updated_at'})
+# Field types that need the HTML preview; records without them are shown as plain text
+_RICH_FIELD_TYPES = frozenset({'image', 'file', 'richtext', 'reference', 'multireference', 'multiselect'})
+# Field types stored as JSON lists
+_JSON_LIST_TYPES = frozenset({'multiselect', 'multireference'})
+
+
+# Static parts of the preview document, built once at import time.
+# The CSS is installed as each document's default stylesheet rather than
+# embedded in the HTML, so it is not re-parsed on every render.
+_PREVIEW_CSS = """
+    body { font-family: 'DejaVu Sans', Arial, sans-serif; padding: 12px 16px; color: #222; font-size: 12pt; }
+    .container { max-width: 900px; margin: 0 auto; }
+    h1 { color: #222; border-bottom: 2px solid #444; padding-bottom: 8px; margin-bottom: 14px; font-size: 24pt; }
+    .record-info { margin-bottom: 18px; color: #555; font-size: 11pt; }
+    .field { margin-bottom: 12px; page-break-inside: avoid; border: 1px solid #e0e0e0; border-radius: 4px; padding: 8px 10px; background: #fafafa; }
+    .field-label { font-weight: bold; color: #333; margin-bottom: 4px; font-size: 12pt; }
+    .field-value { color: #111; padding: 6px 8px; background-color: #fff; border-left: 3px solid #777; margin-top: 4px; font-size: 12pt; }
+    .image-block { text-align: center; margin: 6px 0 4px 0; }
+    .image-block img { max-width: 600px; width: 100%; height: auto; border: 1px solid #ccc; }
+    .image-info { color: #666; font-style: italic; font-size: 10pt; margin-top: 4px; }
+"""
+
+# Print overrides (QTextDocument only honours screen @media rules, so these
+# are appended to the print document's stylesheet instead)
+_PRINT_CSS = _PREVIEW_CSS + """
+    body { padding: 0; font-size: 12pt; }
+    .field { background: #fff; }
+    .image-block img { max-width: 700px; }
+"""
+
+_PREVIEW_HEADER = Template("""
+<html>
+<body>
+    <div class="container">
+        <h1>$title</h1>
+        <div class="record-info">
+            Record ID: $record_id<br>
+            Created: $created<br>
+            Updated: $updated
+        </div>
+""")
+
+_PREVIEW_FIELD = Template("""
+        <div class="field">
+            <div class="field-label">$label:</div>
+            <div class="field-value">$value</div>
+        </div>
+""")
+
+_PREVIEW_FOOTER = """
+    </div>
+</body>
+</html>
+"""
+
+
+# A4 portrait with comfortable margins, shared by Print and Export PDF
+_A4_PORTRAIT_LAYOUT = QPageLayout(
+    QPageSize(QPageSize.PageSizeId.A4),
+    QPageLayout.Orientation.Portrait,
+    QMarginsF(12, 12, 12, 12),
+    QPageLayout.Unit.Millimeter
+)
+
+
+# System fixed-width font for the preview, resolved on first use (needs a QApplication)
+_FIXED_FONT = None
+
+
+def _fixed_font():
+    """Get the system fixed-width font at 10pt, looked up once"""
+    global _FIXED_FONT
+    if _FIXED_FONT is None:
+        _FIXED_FONT = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        _FIXED_FONT.setPointSize(10)
+    return _FIXED_FONT
+
+
+def _apply_print_defaults(printer: QPrinter):
+    """Set high quality output on the shared A4 portrait page layout"""
+    printer.setResolution(300)
+    printer.setPageLayout(_A4_PORTRAIT_LAYOUT)
+
+
+def _first_non_empty(columns) -> str:
+    """SQL expression for the first of columns holding a truthy value, as Python sees it:
+    not NULL, '' or a numeric zero (text '0' counts as a value)
+    """
+    candidates = [f"CASE WHEN typeof({name}) IN ('integer', 'real') THEN NULLIF({name}, 0) "
+                  f"ELSE NULLIF({name}, '') END" for name in columns]
+    if not candidates:
+        return 'NULL'
+    if len(candidates) == 1:
+        return candidates[0]
+    return f"COALESCE({', '.join(candidates)})"
+
+
+def _truncate_inline(text: str, markup: bool = False):
+    """Cap text (raw, before any escaping) at _MAX_INLINE_CHARS; returns (text, HTML note
+    about the cut or ''). With markup, the cut is moved back so it does not end inside a
+    tag or an entity.
+    """
+    if len(text) <= _MAX_INLINE_CHARS:
+        return text, ''
+    cut = text[:_MAX_INLINE_CHARS]
+    if markup:
+        tag_start = cut.rfind('<')
+        if tag_start > cut.rfind('>'):
+            cut = cut[:tag_start]
+        entity_start = cut.rfind('&')
+        if (entity_start > cut.rfind(';') and len(cut) - entity_start <= _MAX_ENTITY_CHARS
+                and not any(c.isspace() for c in cut[entity_start:])):
+            cut = cut[:entity_start]
+    hidden = len(text) - len(cut)
+    note = f'<div class="image-info">… truncated ({hidden:,} more characters)</div>'
+    return cut, note
+
+
+def _wrap_anywhere(doc: QTextDocument):
+    """Let the document's layout break long unbroken runs (URLs, hashes) anywhere,
+    instead of altering the text to make them wrap
+    """
+    option = doc.defaultTextOption()
+    option.setWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
+    doc.setDefaultTextOption(option)
 
 
 class RecordPreviewDialog(QDialog):
@@ -27,6 +176,23 @@ class RecordPreviewDialog(QDialog):
         self.table_display_name = table_display_name
         self.fields = fields
         self.record_id = record_id
+        # Referenced records (and so their labels) loaded since the preview was last
+        # (re)loaded, shared by the screen and print renders, as {'id', '__display'} rows:
+        # {(ref_table_id, display_field): {record_id: record}}.
+        # Only changed on the GUI thread: the screen render fills its own (see new_render)
+        self.referenced_records = {}
+        # (ref_table_id, display_field) -> SQL expression for the display name
+        self._display_col_cache = {}
+        # Table/field metadata does not change while the dialog is open
+        self._table_cache = {}
+        self._fields_cache = {}
+        # Stored file value -> (absolute path, file name, exists), for the preview as last
+        # (re)loaded: files deleted since are seen on the next load
+        self._path_cache = {}
+        # Parsed print version of the preview, shared by Print and Export PDF
+        self._print_doc = None
+        # Plain fields only: show the preview as text (print/PDF still use HTML)
+        self.plain_preview = not any(f['field_type'] in _RICH_FIELD_TYPES for f in fields)
 
         self.setWindowTitle(f"Preview: {table_display_name} - Record #{record_id}")
         self.resize(700, 600)
@@ -39,43 +205,153 @@ class RecordPreviewDialog(QDialog):
         except Exception:
             pass
 
+        # Metadata the background render reads, loaded here so the worker only reads it
+        self.prepare_reference_metadata()
         self.load_record_preview()
-        self.load_related_records()
+        # Related records are only looked up once their tab is first opened
+        self._related_loaded = False
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+    def get_reference_display_name(self, record: dict) -> str:
+        """Return a human-friendly name for a referenced record fetched with its __display column"""
+        value = record.get('__display')
+        if value:
+            return str(value)
+        return f"ID: {record['id']}"
+
+    def get_display_expression(self, table_id: int, display_field_name: str = None) -> str:
+        """SQL expression giving a referenced record's display name, built once per table and display field.
+        Tries the configured display field, then common text-like fields, then any non-id value.
+        """
+        key = (table_id, display_field_name)
+        expression = self._display_col_cache.get(key)
+        if expression is None:
+            ref_fields = self.get_cached_fields(table_id)
+            names = [f['name'] for f in ref_fields if f['name'] != 'id']
+            columns = []
+            if display_field_name and (display_field_name in names or display_field_name in _META_COLUMNS):
+                columns.append(display_field_name)
+            columns.extend(f['name'] for f in ref_fields
+                           if f['name'] != 'id' and f['field_type'] in _DISPLAY_FIELD_TYPES)
+            columns.extend(names)
+            # First non-empty column wins, same order as the per-record fallback used to check
+            expression = _first_non_empty(dict.fromkeys(columns))
+            self._display_col_cache[key] = expression
+        return expression
+
+    def get_cached_table(self, table_id: int) -> Optional[dict]:
+        """Get table metadata, querying the database once per table"""
+        if table_id not in self._table_cache:
+            self._table_cache[table_id] = self.db.get_table(table_id)
+        return self._table_cache[table_id]
+
+    def get_cached_fields(self, table_id: int) -> list:
+        """Get a table's fields, querying the database once per table"""
+        if table_id not in self._fields_cache:
+            self._fields_cache[table_id] = self.db.get_fields(table_id)
+        return self._fields_cache[table_id]
+
+    def prepare_reference_metadata(self):
+        """Load the referenced tables and their display expressions into the dialog caches"""
+        for field in self.fields:
+            ref_table_id = field.get('reference_table_id')
+            if field['field_type'] in ('reference', 'multireference') and ref_table_id:
+                if self.get_cached_table(ref_table_id):
+                    self.get_display_expression(ref_table_id, field.get('reference_display_field'))
+
+    def new_render(self, image_width: int, references: dict, files: dict) -> dict:
+        """State of one HTML render: the width images are downscaled to, and the referenced
+        records and file lookups it uses and fills (see referenced_records, _path_cache)
+        """
+        return {'image_width': image_width, 'references': references, 'files': files}
+
+    def get_file_info(self, value: str, render: dict) -> tuple:
+        """Resolve a stored file value to (absolute path, file name, exists), stat-ing it once per render state"""
+        info = render['files'].get(value)
+        if info is None:
+            abs_path = self.storage.get_file_path(value)
+            info = (abs_path, os.path.basename(abs_path), os.path.exists(abs_path))
+            render['files'][value] = info
+        return info
+
+    def get_image_source(self, abs_path: str, width: int = config.PREVIEW_IMAGE_WIDTH) -> str:
+        """Return a path to show for an image: a cached downscaled copy if it is wider than width"""
+        reader = QImageReader(abs_path)
+        size = reader.size()
+        if not size.isValid() or size.width() <= width:
+            return abs_path
+
+        try:
+            st = os.stat(abs_path)
+            key = f"{abs_path}|{st.st_mtime_ns}|{st.st_size}|{width}"
+            digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+            # Keep PNG for formats that may carry transparency, JPEG otherwise
+            source_format = bytes(reader.format()).decode().lower()
+            ext = 'png' if source_format in ('png', 'gif', 'webp') else 'jpg'
+            thumb_path = os.path.join(config.THUMBNAIL_DIR, f"{digest}.{ext}")
+            if os.path.exists(thumb_path):
+                return thumb_path
+
+            os.makedirs(config.THUMBNAIL_DIR, exist_ok=True)
+            # Decode straight at the target size instead of full resolution
+            reader = QImageReader(abs_path)
+            reader.setScaledSize(size.scaled(width, size.height(), Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            if not image.isNull() and image.save(thumb_path, ext.upper(), 85):
+                return thumb_path
+        except OSError:
+            pass
+        return abs_path
 
-    def get_reference_display_name(self, record: dict, table_id: int, display_field_name: str = None) -> str:
-        """Return a human-friendly name for a referenced record.
-        Tries the configured display field, then common text-like fields, then any non-id value, else ID.
+    def get_referenced_records(self, ref_table: dict, ids: list, display_field_name: str,
+                               render: dict) -> dict:
+        """Get referenced records (ID and display name only) keyed by ID, querying only those
+        not loaded into the render state yet
         """
-        # If a specific display field is specified, use that
-        if display_field_name:
-            value = record.get(display_field_name)
-            if value:
-                return str(value)
-
-        # Get fields for the referenced table
-        ref_fields = self.db.get_fields(table_id)
-
-        # Try to find a good display field (text, email, phone, url)
-        for ref_field in ref_fields:
-            field_type = ref_field['field_type']
-            field_name = ref_field['name']
-            if field_name == 'id':
+        records = render['references'].setdefault((ref_table['id'], display_field_name), {})
+        missing = [rid for rid in ids if rid not in records]
+        if missing:
+            expression = self.get_display_expression(ref_table['id'], display_field_name)
+            records.update(self.db.get_records_bulk(
+                ref_table['name'], missing, columns=f"id, {expression} AS __display"
+            ))
+        return records
+
+    def decode_json_fields(self, record: dict):
+        """Decode multiselect/multireference values in place, once per render.
+        Values that are not valid JSON lists are left as their original string.
+        """
+        for field in self.fields:
+            if field['field_type'] in _JSON_LIST_TYPES:
+                value = record.get(field['name'])
+                if isinstance(value, str) and value:
+                    try:
+                        decoded = fast_json.loads(value)
+                    except ValueError:
+                        continue
+                    if isinstance(decoded, list):
+                        record[field['name']] = decoded
+
+    def prefetch_referenced_records(self, record: dict, render: dict):
+        """Load every record referenced by this record not loaded yet, one query per referenced table"""
+        ids_by_table = {}
+
+        for field in self.fields:
+            value = record.get(field['name'])
+            ref_table_id = field.get('reference_table_id')
+            if not value or not ref_table_id:
                 continue
-            if field_type in ['text', 'email', 'phone', 'url']:
-                value = record.get(field_name)
-                if value:
-                    return str(value)
-
-        # If no text field found, try any field with a value
-        for ref_field in ref_fields:
-            field_name = ref_field['name']
-            if field_name != 'id':
-                value = record.get(field_name)
-                if value:
-                    return str(value)
-
-        # Fallback to ID
-        return f"ID: {record['id']}"
+
+            key = (ref_table_id, field.get('reference_display_field'))
+            if field['field_type'] == 'reference':
+                ids_by_table.setdefault(key, []).append(value)
+            elif field['field_type'] == 'multireference' and isinstance(value, list):
+                ids_by_table.setdefault(key, []).extend(value)
+
+        for (ref_table_id, display_field), ids in ids_by_table.items():
+            ref_table = self.get_cached_table(ref_table_id)
+            if ref_table:
+                self.get_referenced_records(ref_table, ids, display_field, render)
 
     def init_ui(self):
         """Initialize the user interface"""
@@ -89,10 +365,16 @@ class RecordPreviewDialog(QDialog):
         details_tab = QWidget()
         details_layout = QVBoxLayout(details_tab)
 
-        self.preview_text = QTextEdit()
-        self.preview_text.setReadOnly(True)
-        font = QFont("Monospace", 10)
-        self.preview_text.setFont(font)
+        # QTextBrowser is read-only already and skips QTextEdit's editing machinery
+        self.preview_text = QTextBrowser()
+        # Nothing in the preview should navigate the browser away from the record
+        self.preview_text.setOpenLinks(False)
+        self.preview_text.setFont(_fixed_font())
+        self.preview_text.document().setDefaultStyleSheet(_PREVIEW_CSS)
+        # Read-only, so an undo stack would only cost memory and time
+        self.preview_text.setUndoRedoEnabled(False)
+        # Long unbroken values wrap anywhere rather than widening the page
+        self.preview_text.setWordWrapMode(QTextOption.WrapMode.WrapAtWordBoundaryOrAnywhere)
         details_layout.addWidget(self.preview_text)
 
         self.tabs.addTab(details_tab, "Record Details")
@@ -117,13 +399,13 @@ class RecordPreviewDialog(QDialog):
         # Buttons
         btn_layout = QHBoxLayout()
 
-        btn_print = QPushButton("Print")
-        btn_print.clicked.connect(self.print_record)
-        btn_layout.addWidget(btn_print)
+        self.btn_print = QPushButton("Print")
+        self.btn_print.clicked.connect(self.print_record)
+        btn_layout.addWidget(self.btn_print)
 
-        btn_export_pdf = QPushButton("Export PDF")
-        btn_export_pdf.clicked.connect(self.export_pdf)
-        btn_layout.addWidget(btn_export_pdf)
+        self.btn_export_pdf = QPushButton("Export PDF")
+        self.btn_export_pdf.clicked.connect(self.export_pdf)
+        btn_layout.addWidget(self.btn_export_pdf)
 
         btn_layout.addStretch()
 
@@ -135,172 +417,285 @@ class RecordPreviewDialog(QDialog):
         layout.addLayout(btn_layout)
 
     def load_record_preview(self):
-        """Load and format the record for preview"""
-        record = self.db.get_record(self.table_name, self.record_id)
-        if not record:
+        """Load and format the record for preview on a background thread"""
+        self.preview_text.setPlainText("Loading…")
+        self._print_doc = None
+        self.referenced_records = {}
+        self._path_cache = {}
+        self.btn_print.setEnabled(False)
+        self.btn_export_pdf.setEnabled(False)
+
+        # Keep a reference so the worker (and its signals) outlive this call.
+        # Records with only plain fields skip the HTML pipeline on screen.
+        if self.plain_preview:
+            render = None
+            self.preview_worker = Worker(self.build_plain_preview)
+        else:
+            # The worker fills its own lookups; the dialog adopts them in on_preview_ready
+            render = self.new_render(config.PREVIEW_IMAGE_WIDTH, {}, {})
+            self.preview_worker = Worker(self.build_preview_html, render)
+        self.preview_worker.signals.finished.connect(
+            lambda preview: self.on_preview_ready(preview, render)
+        )
+        self.preview_worker.signals.failed.connect(self.on_preview_failed)
+        QThreadPool.globalInstance().start(self.preview_worker)
+
+    def on_preview_ready(self, preview, render: dict = None):
+        """Show the preview (HTML, or plain text for plain records) built by the background
+        worker, keeping the referenced records and file lookups its render state gathered
+        """
+        if preview is None:
             self.preview_text.setPlainText("Record not found.")
             return
 
-        # Build HTML preview
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: 'DejaVu Sans', Arial, sans-serif; padding: 12px 16px; color: #222; font-size: 12pt; }}
-                .container {{ max-width: 900px; margin: 0 auto; }}
-                h1 {{ color: #222; border-bottom: 2px solid #444; padding-bottom: 8px; margin-bottom: 14px; font-size: 24pt; }}
-                .record-info {{ margin-bottom: 18px; color: #555; font-size: 11pt; }}
-                .field {{ margin-bottom: 12px; page-break-inside: avoid; border: 1px solid #e0e0e0; border-radius: 4px; padding: 8px 10px; background: #fafafa; }}
-                .field-label {{ font-weight: bold; color: #333; margin-bottom: 4px; font-size: 12pt; }}
-                .field-value {{ color: #111; padding: 6px 8px; background-color: #fff; border-left: 3px solid #777; margin-top: 4px; font-size: 12pt; }}
-                .image-block {{ text-align: center; margin: 6px 0 4px 0; }}
-                .image-block img {{ max-width: 600px; width: 100%; height: auto; border: 1px solid #ccc; }}
-                .image-info {{ color: #666; font-style: italic; font-size: 10pt; margin-top: 4px; }}
-                @media print {{ body {{ padding: 0; font-size: 12pt; }} .field {{ background: #fff; }} .image-block img {{ max-width: 700px; }} }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>{self.table_display_name}</h1>
-                <div class="record-info">
-                    Record ID: {record['id']}<br>
-                    Created: {record.get('created_at', 'N/A')}<br>
-                    Updated: {record.get('updated_at', 'N/A')}
-                </div>
+        if render is not None:
+            self.referenced_records = render['references']
+            self._path_cache = render['files']
+
+        # Install the content with repaints and signals held back, so it is laid out once
+        text_edit = self.preview_text
+        text_edit.setUpdatesEnabled(False)
+        text_edit.blockSignals(True)
+        try:
+            if self.plain_preview:
+                text_edit.setPlainText(preview)
+            else:
+                text_edit.setHtml(preview)
+        finally:
+            text_edit.blockSignals(False)
+            text_edit.setUpdatesEnabled(True)
+        self.btn_print.setEnabled(True)
+        self.btn_export_pdf.setEnabled(True)
+
+    def on_preview_failed(self, message: str):
+        """Report a failed background preview build"""
+        self.preview_text.setPlainText(f"Failed to load preview: {message}")
+
+    def build_plain_preview(self) -> Optional[str]:
+        """Build an aligned plain-text preview; returns None if the record does not exist.
+        Only used when no field needs HTML (see _RICH_FIELD_TYPES); runs on a worker thread.
+        """
+        record = self.db.get_record(self.table_name, self.record_id)
+        if not record:
+            return None
+
+        lines = [
+            self.table_display_name,
+            '',
+            f"Record ID: {record['id']}",
+            f"Created: {record.get('created_at', 'N/A')}",
+            f"Updated: {record.get('updated_at', 'N/A')}",
+            ''
+        ]
+        for field in self.fields:
+            value = record.get(field['name'])
+            if value is None or value == '':
+                value = '(empty)'
+            elif field['field_type'] == 'boolean':
+                value = 'Yes' if value else 'No'
+            lines.append(f"{field['display_name']:>20}: {value}")
+
+        return '\n'.join(lines)
+
+    def build_preview_html(self, render: dict) -> Optional[str]:
+        """Build the preview HTML with a render state (see new_render); returns None if the
+        record does not exist. Runs on a worker thread for the screen preview, so it must not
+        touch widgets or dialog state: lookups go into the render state only.
         """
+        record = self.db.get_record(self.table_name, self.record_id)
+        if not record:
+            return None
+
+        self.decode_json_fields(record)
+        self.prefetch_referenced_records(record, render)
+
+        # Build HTML preview (fragments are written to one buffer and read out once)
+        buf = StringIO()
+        buf.write(_PREVIEW_HEADER.substitute(
+            title=html.escape(self.table_display_name),
+            record_id=record['id'],
+            created=record.get('created_at', 'N/A'),
+            updated=record.get('updated_at', 'N/A')
+        ))
 
         # Add fields
         for field in self.fields:
-            field_name = field['name']
-            field_display = field['display_name']
-            field_type = field['field_type']
-            value = record.get(field_name)
+            value = record.get(field['name'])
 
             if value is None or value == '':
                 value_display = '<em>(empty)</em>'
             else:
-                value_display = self.format_field_value(field, value)
-
-            html += f"""
-            <div class="field">
-                <div class="field-label">{field_display}:</div>
-                <div class="field-value">{value_display}</div>
-            </div>
-            """
-
-        html += """
-            </div>
-        </body>
-        </html>
-        """
+                value_display = self.format_field_value(field, value, render)
+
+            buf.write(_PREVIEW_FIELD.substitute(
+                label=html.escape(field['display_name']),
+                value=value_display
+            ))
+
+        buf.write(_PREVIEW_FOOTER)
 
-        self.preview_text.setHtml(html)
+        return buf.getvalue()
 
-    def format_field_value(self, field: dict, value) -> str:
+    def format_field_value(self, field: dict, value, render: dict) -> str:
         """Format field value for HTML display"""
-        field_type = field['field_type']
-
-        if field_type == 'boolean':
-            return 'Yes' if value else 'No'
-
-        elif field_type == 'multiselect':
-            try:
-                items = json.loads(value) if isinstance(value, str) else value
-                if items:
-                    return '<br>'.join([f"• {item}" for item in items])
-                return '<em>(none selected)</em>'
-            except:
-                return str(value)
-
-        elif field_type == 'image':
-            if value:
-                abs_path = self.storage.get_file_path(value)
-                filename = os.path.basename(abs_path)
-                if os.path.exists(abs_path):
-                    # Display the image inline with a max width for readability
-                    safe_src = QUrl.fromLocalFile(abs_path).toString()
-                    return (
-                        f'<div class="image-block">'
-                        f'<img src="{safe_src}" alt="{filename}" />'
-                        f'<div class="image-info">📷 {filename}</div>'
-                        f'</div>'
-                    )
-                return f'<span class="image-info">📷 {filename} (file not found)</span>'
-            return '<em>(no image)</em>'
-
-        elif field_type == 'file':
-            if value:
-                abs_path = self.storage.get_file_path(value)
-                filename = os.path.basename(abs_path)
-                if os.path.exists(abs_path):
-                    return f'<span class="image-info">📎 {filename}</span>'
-                return f'<span class="image-info">📎 {filename} (file not found)</span>'
-            return '<em>(no file)</em>'
-
-        elif field_type == 'reference':
-            if value:
-                # Get referenced table and record to show a friendly label
-                ref_table_id = field.get('reference_table_id')
-                if ref_table_id:
-                    ref_table = self.db.get_table(ref_table_id)
-                    if ref_table:
-                        ref_record = self.db.get_record(ref_table['name'], value)
+        handler = self._FORMATTERS.get(field['field_type'], RecordPreviewDialog._fmt_default)
+        return handler(self, field, value, render)
+
+    def _fmt_boolean(self, field: dict, value, render: dict) -> str:
+        return 'Yes' if value else 'No'
+
+    def _fmt_multiselect(self, field: dict, value, render: dict) -> str:
+        # Lists were decoded by decode_json_fields; anything else is shown as stored
+        if not isinstance(value, list):
+            return html.escape(str(value))
+        if value:
+            return '<br>'.join([f"• {html.escape(str(item))}" for item in value])
+        return '<em>(none selected)</em>'
+
+    def _fmt_image(self, field: dict, value, render: dict) -> str:
+        if value:
+            abs_path, filename, exists = self.get_file_info(value, render)
+            filename = html.escape(filename)
+            if exists:
+                # Display the image inline with a max width for readability
+                safe_src = QUrl.fromLocalFile(self.get_image_source(abs_path, render['image_width'])).toString()
+                return (
+                    f'<div class="image-block">'
+                    f'<img src="{safe_src}" alt="{filename}" />'
+                    f'<div class="image-info">📷 {filename}</div>'
+                    f'</div>'
+                )
+            return f'<span class="image-info">📷 {filename} (file not found)</span>'
+        return '<em>(no image)</em>'
+
+    def _fmt_file(self, field: dict, value, render: dict) -> str:
+        if value:
+            abs_path, filename, exists = self.get_file_info(value, render)
+            filename = html.escape(filename)
+            if exists:
+                return f'<span class="image-info">📎 {filename}</span>'
+            return f'<span class="image-info">📎 {filename} (file not found)</span>'
+        return '<em>(no file)</em>'
+
+    def _fmt_reference(self, field: dict, value, render: dict) -> str:
+        if value:
+            # Get referenced table and record to show a friendly label
+            ref_table_id = field.get('reference_table_id')
+            if ref_table_id:
+                ref_table = self.get_cached_table(ref_table_id)
+                if ref_table:
+                    table_label = html.escape(ref_table['display_name'])
+                    display_field = field.get('reference_display_field')
+                    ref_record = self.get_referenced_records(ref_table, [value], display_field, render).get(value)
+                    if ref_record:
+                        display_name = html.escape(self.get_reference_display_name(ref_record))
+                        return f"→ {table_label}: {display_name}"
+                    return f"→ {table_label} (ID: {value})"
+            return f"→ Record ID: {value}"
+        return '<em>(no reference)</em>'
+
+    def _fmt_multireference(self, field: dict, value, render: dict) -> str:
+        # Lists were decoded by decode_json_fields; anything else is shown as stored
+        if not isinstance(value, list):
+            return html.escape(str(value))
+        if value:
+            ref_table_id = field.get('reference_table_id')
+            if ref_table_id:
+                ref_table = self.get_cached_table(ref_table_id)
+                if ref_table:
+                    display_field = field.get('reference_display_field')
+                    records_by_id = self.get_referenced_records(ref_table, value, display_field, render)
+
+                    def label(rid):
+                        ref_record = records_by_id.get(rid)
                         if ref_record:
-                            display_field = field.get('reference_display_field')
-                            display_name = self.get_reference_display_name(ref_record, ref_table_id, display_field)
-                            return f"→ {ref_table['display_name']}: {display_name}"
-                        return f"→ {ref_table['display_name']} (ID: {value})"
-                return f"→ Record ID: {value}"
-            return '<em>(no reference)</em>'
-
-        elif field_type == 'multireference':
-            try:
-                ids = json.loads(value) if isinstance(value, str) else value
-                if ids:
-                    ref_table_id = field.get('reference_table_id')
-                    if ref_table_id:
-                        ref_table = self.db.get_table(ref_table_id)
-                        if ref_table:
-                            labels = []
-                            for rid in ids:
-                                ref_record = self.db.get_record(ref_table['name'], rid)
-                                if ref_record:
-                                    display_field = field.get('reference_display_field')
-                                    labels.append(self.get_reference_display_name(ref_record, ref_table_id, display_field))
-                                else:
-                                    labels.append(f"ID: {rid}")
-                            return '<br>'.join([f"• {lbl}" for lbl in labels])
-                    # Fallback: just show IDs
-                    return '<br>'.join([f"• ID: {rid}" for rid in ids])
-                return '<em>(no references)</em>'
-            except:
-                return str(value)
-
-        elif field_type == 'richtext':
-            # Preserve line breaks
-            return str(value).replace('\n', '<br>')
-
-        else:
-            # Escape HTML and preserve formatting
-            return str(value).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\n', '<br>')
+                            return html.escape(self.get_reference_display_name(ref_record))
+                        return f"ID: {html.escape(str(rid))}"
+
+                    return '<br>'.join("• " + label(rid) for rid in value)
+            # Fallback: just show IDs
+            return '<br>'.join([f"• ID: {html.escape(str(rid))}" for rid in value])
+        return '<em>(no references)</em>'
+
+    def _fmt_richtext(self, field: dict, value, render: dict) -> str:
+        # Preserve line breaks
+        text, note = _truncate_inline(str(value), markup=True)
+        return text.translate(_LINE_BREAK_TABLE) + note
+
+    def _fmt_default(self, field: dict, value, render: dict) -> str:
+        # Escape HTML and preserve formatting
+        text, note = _truncate_inline(str(value))
+        return text.translate(_HTML_ESCAPE_TABLE) + note
+
+    # Field type -> formatter; types not listed use _fmt_default
+    _FORMATTERS = {
+        'boolean': _fmt_boolean,
+        'multiselect': _fmt_multiselect,
+        'image': _fmt_image,
+        'file': _fmt_file,
+        'reference': _fmt_reference,
+        'multireference': _fmt_multireference,
+        'richtext': _fmt_richtext
+    }
 
     def print_record(self):
         """Print the record"""
         printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-        try:
-            # High quality, A4 portrait with comfortable margins
-            printer.setResolution(300)
-            layout = printer.pageLayout()
-            layout.setOrientation(QPageLayout.Orientation.Portrait)
-            layout.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-            layout.setMargins(QMarginsF(12, 12, 12, 12))  # millimeters by default
-            printer.setPageLayout(layout)
-        except Exception:
-            pass
+        _apply_print_defaults(printer)
         dialog = QPrintDialog(printer, self)
 
         if dialog.exec() == QPrintDialog.DialogCode.Accepted:
-            self.preview_text.document().print(printer)
+            self.print_document(printer)
+
+    def get_print_document(self) -> Optional[QTextDocument]:
+        """Get the print version of the preview, parsing its HTML only on first use"""
+        if self._print_doc is None:
+            # On the GUI thread, so the render reuses (and adds to) the dialog's lookups
+            preview_html = self.build_preview_html(self.new_render(
+                config.PRINT_IMAGE_WIDTH, self.referenced_records, self._path_cache
+            ))
+            if preview_html is None:
+                return None
+
+            doc = QTextDocument(self)
+            doc.setBaseUrl(QUrl.fromLocalFile(os.path.abspath(self.storage.base_dir)))
+            doc.setDefaultStyleSheet(_PRINT_CSS)
+            _wrap_anywhere(doc)
+            doc.setHtml(preview_html)
+            # Create the layout object here, on the GUI thread; PDF export copies this
+            # document from a worker thread and must not create children of it there
+            doc.documentLayout()
+            self._print_doc = doc
+        return self._print_doc
+
+    @staticmethod
+    def copy_print_document(source: QTextDocument, printer: QPrinter) -> QTextDocument:
+        """Copy the print document and size it for the printer's page.
+        The copy belongs to the calling thread.
+        """
+        # Work on a copy so each printer's page size doesn't disturb the cached document
+        doc = source.clone()
+        doc.setBaseUrl(source.baseUrl())
+        # A page size that matches the printer lets print() paginate this document
+        # directly instead of making another internal copy
+        doc.setPageSize(printer.pageRect(QPrinter.Unit.Point).size())
+        return doc
+
+    def print_document(self, printer: QPrinter):
+        """Print a document laid out for the printer page, separate from the on-screen preview"""
+        source = self.get_print_document()
+        if source is not None:
+            doc = self.copy_print_document(source, printer)
+            doc.print(printer)
+            doc.deleteLater()
+
+    @staticmethod
+    def write_pdf(source: QTextDocument, printer: QPrinter) -> str:
+        """Render the print document through a PDF printer; runs on a worker thread, returns the output file"""
+        # Copy on this thread so the document Qt lays out and paints belongs to it
+        doc = RecordPreviewDialog.copy_print_document(source, printer)
+        doc.print(printer)
+        return printer.outputFileName()
 
     def export_pdf(self):
         """Export record to PDF"""
@@ -320,62 +715,70 @@ class RecordPreviewDialog(QDialog):
             printer = QPrinter(QPrinter.PrinterMode.HighResolution)
             printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
             printer.setOutputFileName(file_path)
-            try:
-                # High quality, A4 portrait with comfortable margins
-                printer.setResolution(300)
-                layout = printer.pageLayout()
-                layout.setOrientation(QPageLayout.Orientation.Portrait)
-                layout.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-                layout.setMargins(QMarginsF(12, 12, 12, 12))
-                printer.setPageLayout(layout)
-            except Exception:
-                pass
-
-            self.preview_text.document().print(printer)
-
-            QMessageBox.information(
-                self,
-                "Export Successful",
-                f"Record exported to:\n{file_path}"
-            )
+            _apply_print_defaults(printer)
+
+            source = self.get_print_document()
+            if source is None:
+                return
+
+            # Render on a pool thread; the cached document is only read (and the printer
+            # only used) there until it finishes, so printing is held off meanwhile
+            self.btn_print.setEnabled(False)
+            self.btn_export_pdf.setEnabled(False)
+            self.pdf_worker = Worker(self.write_pdf, source, printer)
+            self.pdf_worker.signals.finished.connect(self.on_pdf_exported)
+            self.pdf_worker.signals.failed.connect(self.on_pdf_failed)
+            QThreadPool.globalInstance().start(self.pdf_worker)
+
+    def on_pdf_exported(self, file_path: str):
+        """Report a finished background PDF export"""
+        self.pdf_worker = None
+        self.btn_print.setEnabled(True)
+        self.btn_export_pdf.setEnabled(True)
+        QMessageBox.information(
+            self,
+            "Export Successful",
+            f"Record exported to:\n{file_path}"
+        )
+
+    def on_pdf_failed(self, message: str):
+        """Report a failed background PDF export"""
+        self.pdf_worker = None
+        self.btn_print.setEnabled(True)
+        self.btn_export_pdf.setEnabled(True)
+        QMessageBox.critical(self, "Export Failed", f"Failed to export PDF:\n{message}")
+
+    def on_tab_changed(self, index: int):
+        """Load the Related Records tab the first time it is shown"""
+        if index == 1 and not self._related_loaded:
+            self._related_loaded = True
+            self.load_related_records()
 
     def load_related_records(self):
         """Load records from other tables that reference this record"""
-        # Find all tables and their reference fields pointing to this table
-        all_tables = self.db.get_all_tables()
-        related_data = []
+        # One (table, field) source per reference field pointing to this table, each
+        # selecting the record ID and the preview column value (first text-like field)
+        ref_fields = self.db.get_reference_fields_targeting(self.table_id)
+        sources = []
+        for field in ref_fields:
+            preview_expression = _first_non_empty(
+                f['name'] for f in self.get_cached_fields(field['table_id'])
+                if f['field_type'] in _DISPLAY_FIELD_TYPES and f['name'] != 'id'
+            )
+            sources.append((field['table_name'], field['name'], f"id, {preview_expression} AS __preview"))
 
-        for table in all_tables:
-            table_id = table['id']
-            table_name = table['name']
-            table_display_name = table['display_name']
-
-            # Get fields for this table
-            fields = self.db.get_fields(table_id)
-
-            # Find reference fields pointing to our table
-            for field in fields:
-                if field['field_type'] == 'reference' and field.get('reference_table_id') == self.table_id:
-                    # This field references our table
-                    # Find records where this field equals our record_id
-                    where_clause = f"{field['name']} = ?"
-                    where_params = (self.record_id,)
-
-                    referencing_records = self.db.get_records(
-                        table_name,
-                        where_clause=where_clause,
-                        where_params=where_params
-                    )
-
-                    for rec in referencing_records:
-                        related_data.append({
-                            'table_name': table_display_name,
-                            'field_name': field['display_name'],
-                            'record_id': rec['id'],
-                            'record': rec,
-                            'source_table': table_name,
-                            'source_table_id': table_id
-                        })
+        related_data = []
+        if sources:
+            for rec in self.db.get_referencing_records(sources, self.record_id):
+                field = ref_fields[rec['__source']]
+                related_data.append({
+                    'table_name': field['table_display_name'],
+                    'field_name': field['display_name'],
+                    'record_id': rec['id'],
+                    'preview': rec['__preview'],
+                    'source_table': field['table_name'],
+                    'source_table_id': field['table_id']
+                })
 
         # Update the related records table
         if not related_data:
@@ -386,43 +789,45 @@ class RecordPreviewDialog(QDialog):
         self.related_info_label.setText(f"Found {len(related_data)} record(s) referencing this record:")
 
         # Set up table
-        self.related_table.setColumnCount(4)
-        self.related_table.setHorizontalHeaderLabels(['Table', 'Field', 'Record ID', 'Preview'])
-        self.related_table.setRowCount(len(related_data))
-
-        for row_idx, data in enumerate(related_data):
-            # Table name
-            table_item = QTableWidgetItem(data['table_name'])
-            self.related_table.setItem(row_idx, 0, table_item)
-
-            # Field name
-            field_item = QTableWidgetItem(data['field_name'])
-            self.related_table.setItem(row_idx, 1, field_item)
-
-            # Record ID
-            id_item = QTableWidgetItem(str(data['record_id']))
-            id_item.setData(Qt.ItemDataRole.UserRole, {
-                'table_name': data['source_table'],
-                'table_id': data['source_table_id'],
-                'record_id': data['record_id']
-            })
-            self.related_table.setItem(row_idx, 2, id_item)
-
-            # Preview - get first text field value
-            record = data['record']
-            preview_text = ""
-            source_fields = self.db.get_fields(data['source_table_id'])
-            for f in source_fields:
-                if f['field_type'] in ['text', 'email', 'url', 'phone'] and f['name'] != 'id':
-                    value = record.get(f['name'])
-                    if value:
-                        preview_text = str(value)[:50]
-                        break
-
-            if not preview_text:
-                preview_text = f"Record #{data['record_id']}"
-
-            preview_item = QTableWidgetItem(preview_text)
-            self.related_table.setItem(row_idx, 3, preview_item)
-
-        self.related_table.resizeColumnsToContents()
+        table = self.related_table
+        table.setColumnCount(4)
+        table.setHorizontalHeaderLabels(['Table', 'Field', 'Record ID', 'Preview'])
+
+        # Fill every cell with repaints, sorting and signals held back, then lay out once
+        table.setUpdatesEnabled(False)
+        table.setSortingEnabled(False)
+        table.blockSignals(True)
+        try:
+            table.setRowCount(len(related_data))
+
+            for row_idx, data in enumerate(related_data):
+                # Table name
+                table_item = QTableWidgetItem(data['table_name'])
+                table.setItem(row_idx, 0, table_item)
+
+                # Field name
+                field_item = QTableWidgetItem(data['field_name'])
+                table.setItem(row_idx, 1, field_item)
+
+                # Record ID
+                id_item = QTableWidgetItem(str(data['record_id']))
+                id_item.setData(Qt.ItemDataRole.UserRole, {
+                    'table_name': data['source_table'],
+                    'table_id': data['source_table_id'],
+                    'record_id': data['record_id']
+                })
+                table.setItem(row_idx, 2, id_item)
+
+                # Preview - first text field value
+                if data['preview']:
+                    preview_text = str(data['preview'])[:50]
+                else:
+                    preview_text = f"Record #{data['record_id']}"
+
+                preview_item = QTableWidgetItem(preview_text)
+                table.setItem(row_idx, 3, preview_item)
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
+
+        table.resizeColumnsToContents()
@@ -2,14 +2,137 @@
 Record view for displaying and managing records in a table
 """
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QTableWidget, QTableWidgetItem, QLineEdit, QLabel,
+                             QTableView, QAbstractItemView, QLineEdit, QLabel,
                              QMessageBox, QHeaderView, QComboBox, QSpinBox,
-                             QFileDialog)
-from PyQt6.QtCore import Qt
+                             QFileDialog, QProgressDialog)
+from PyQt6.QtCore import Qt, QTimer, QThreadPool, QAbstractTableModel, QModelIndex
 from database import DatabaseManager
 from storage import StorageManager
+from workers import Worker, ProgressWorker
+from collections import OrderedDict
+from functools import partial
+import fast_json
 import json
 import csv
+import os
+
+
+# Field types the search box matches against
+SEARCHABLE_FIELD_TYPES = frozenset({'text', 'email', 'url', 'phone', 'richtext'})
+
+# Pages of records kept in memory (the current one and its prefetched neighbours)
+PAGE_CACHE_SIZE = 4
+
+# Pause in typing (ms) before the search box runs its search
+SEARCH_DEBOUNCE_MS = 250
+
+# Formatted non-reference values kept before the cache is emptied
+FORMAT_CACHE_SIZE = 10000
+
+# Referenced records named in a multireference cell before the rest are summarised as "+N more"
+MULTIREF_PREVIEW_LIMIT = 5
+
+# Formatted cells kept across pages, least recently used dropped first
+DISPLAY_CACHE_SIZE = 10000
+
+
+class RecordsModel(QAbstractTableModel):
+    """Table model over a page of records; cells are formatted only when Qt asks for them"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+        self.headers = ['ID']
+        # Per field column: the record key it shows and formatter(value) -> display text
+        self.column_names = []
+        self.column_formatters = []
+        # (record id, column, value) -> formatted text, kept across pages until records change
+        self._display_cache = OrderedDict()
+
+    def set_columns(self, headers: list, names: list, formatters: list):
+        """Set the field columns shown after the ID column"""
+        self.beginResetModel()
+        self.headers = ['ID'] + headers
+        self.column_names = names
+        self.column_formatters = formatters
+        self._display_cache.clear()
+        self.endResetModel()
+
+    def set_records(self, records: list):
+        """Replace the records shown"""
+        self.beginResetModel()
+        self.records = records
+        self.endResetModel()
+
+    def clear_display_cache(self):
+        """Forget formatted cells, after records (possibly referenced ones) changed"""
+        self._display_cache.clear()
+
+    def reverse_records(self) -> list:
+        """Show the records in the opposite order, keeping their formatted text"""
+        self.beginResetModel()
+        self.records = self.records[::-1]
+        self.endResetModel()
+        return self.records
+
+    def sort_records(self, column: str, descending: bool) -> list:
+        """Reorder the records by column the way SQLite's ORDER BY column, id would"""
+        def sort_key(record):
+            value = record.get(column)
+            # SQLite orders NULL before numbers, numbers before text, text before blobs
+            if value is None:
+                rank = 0
+            elif isinstance(value, (int, float)):
+                rank = 1
+            elif isinstance(value, str):
+                rank = 2
+            else:
+                rank = 3
+            return (rank, value if value is not None else 0, record['id'])
+
+        self.beginResetModel()
+        self.records = sorted(self.records, key=sort_key, reverse=descending)
+        self.endResetModel()
+        return self.records
+
+    def record_id(self, row: int):
+        """ID of the record shown in a row, or None"""
+        if 0 <= row < len(self.records):
+            return self.records[row]['id']
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            record = self.records[row]
+            if column == 0:
+                return str(record['id'])
+            value = record.get(self.column_names[column - 1], '')
+            key = (record['id'], column, value)
+            text = self._display_cache.get(key)
+            if text is None:
+                text = self._display_cache[key] = self.column_formatters[column - 1](value)
+                if len(self._display_cache) > DISPLAY_CACHE_SIZE:
+                    self._display_cache.popitem(last=False)
+            else:
+                self._display_cache.move_to_end(key)
+            return text
+        if role == Qt.ItemDataRole.UserRole:
+            return self.records[row]['id']
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section] if 0 <= section < len(self.headers) else None
+        return super().headerData(section, orientation, role)
 
 
 class RecordView(QWidget):
@@ -27,6 +150,33 @@ class RecordView(QWidget):
         self.sort_column = 'id'
         self.sort_order = 'ASC'
         self.active_filters = {}
+        # Canonical JSON of active_filters ('' for none), which identifies them in page keys
+        self.filter_key = ''
+        # Search term the list is limited to ('' for all records), paged like the full list
+        self.search_term = ''
+        # ((search_term, filter_key), sort_column, sort_order, page_size, page) -> records,
+        # most recent last
+        self._page_cache = OrderedDict()
+        # Page key -> (sort value, id) of the page's last record, where the next page starts
+        self._page_cursors = {}
+        # (search_term, filter_key) -> record count, kept until records change
+        self._total_cache = {}
+        # DatabaseManager.write_version the caches above were last checked against
+        self._seen_write_version = db.write_version
+        # Page key of the records in the table (None until the first page is shown)
+        self._shown_key = None
+        # Sequence number of the latest load_records request
+        self._fetch_seq = 0
+        # Bumped whenever cached pages go stale, so late prefetch results are dropped
+        self._page_cache_generation = 0
+        # Referenced tables' metadata by table ID, read once in load_fields
+        self._ref_table_cache = {}
+        # Referenced records for the records being shown, rebuilt with every page
+        self._ref_records = {}
+        # Reference field name -> columns of the referenced table tried, in order, for its display text
+        self.reference_display_fields = {}
+        # (field type, value type, value) -> display text for values that need no lookups
+        self._format_cache = {}
 
         self.init_ui()
         self.load_fields()
@@ -43,6 +193,12 @@ class RecordView(QWidget):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Search...")
         self.search_input.returnPressed.connect(self.search_records)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+        # Search as the user types, once they pause
+        self.search_debounce = QTimer(self)
+        self.search_debounce.setSingleShot(True)
+        self.search_debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_debounce.timeout.connect(self.launch_search)
         toolbar.addWidget(QLabel("Search:"))
         toolbar.addWidget(self.search_input)
 
@@ -69,11 +225,13 @@ class RecordView(QWidget):
         layout.addLayout(toolbar)
 
         # Records table
-        self.records_table = QTableWidget()
-        self.records_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.records_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.records_model = RecordsModel(self)
+        self.records_table = QTableView()
+        self.records_table.setModel(self.records_model)
+        self.records_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.records_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.records_table.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
-        self.records_table.itemDoubleClicked.connect(self.edit_record)
+        self.records_table.doubleClicked.connect(self.edit_record)
         layout.addWidget(self.records_table)
 
         # Bottom toolbar (pagination and actions)
@@ -135,150 +293,439 @@ class RecordView(QWidget):
 
         # Filter fields to only show those with show_in_list = True
         self.visible_fields = [f for f in self.fields if f.get('show_in_list', True)]
+        self.searchable_fields = [f['name'] for f in self.fields
+                                  if f['field_type'] in SEARCHABLE_FIELD_TYPES]
+        # (Re)build the search index (or drop it, with nothing to search) in the background:
+        # a rebuild reindexes every row. Searches meanwhile use the LIKE scan, as they only
+        # use the index once it lists exactly these fields
+        self.search_index_worker = Worker(self.db.sync_search_index, self.table_name,
+                                          list(self.searchable_fields))
+        QThreadPool.globalInstance().start(self.search_index_worker)
+
+        # Decide once how each reference field's records are displayed; referenced
+        # tables' metadata only changes with the schema, so it is read here too
+        ref_fields_by_table = {}
+        self._ref_table_cache = {}
+        self.reference_display_fields = {}
+        for field in self.fields:
+            ref_table_id = field.get('reference_table_id')
+            if field['field_type'] in ('reference', 'multireference') and ref_table_id:
+                if ref_table_id not in ref_fields_by_table:
+                    self._ref_table_cache[ref_table_id] = self.db.get_table(ref_table_id)
+                    ref_fields_by_table[ref_table_id] = self.db.get_fields(ref_table_id)
+                self.reference_display_fields[field['name']] = self.resolve_display_fields(
+                    ref_fields_by_table[ref_table_id]
+                )
+
+        # Per visible column, the record key and a formatter taking just the value,
+        # so rendering a cell does no field-dict lookups
+        self.column_names = [f['name'] for f in self.visible_fields]
+        self.column_formatters = [self.make_formatter(f) for f in self.visible_fields]
+
+        # Columns a page is read with: the ID, the visible fields and the references to resolve
+        reference_names = [f['name'] for f in self.fields
+                           if f['field_type'] in ('reference', 'multireference')]
+        self.list_columns = list(dict.fromkeys(['id'] + self.column_names + reference_names))
 
         # Set up table columns (only visible fields)
-        columns = ['ID'] + [f['display_name'] for f in self.visible_fields]
-        self.records_table.setColumnCount(len(columns))
-        self.records_table.setHorizontalHeaderLabels(columns)
+        self.records_model.set_columns(
+            [f['display_name'] for f in self.visible_fields],
+            self.column_names,
+            self.column_formatters
+        )
         self.records_table.horizontalHeader().setStretchLastSection(True)
 
+    def get_searchable_fields(self) -> list:
+        """Names of the fields the search box matches against (decided in load_fields)"""
+        return self.searchable_fields
+
     def load_records(self):
-        """Load records from database"""
+        """Load the current page of records (all records, or the current search's matches)
+        on a worker thread; the table is filled in on_records_ready.
+        """
+        # Only the latest request's result is shown
+        self._fetch_seq += 1
+        seq = self._fetch_seq
+
+        self.btn_prev.setEnabled(False)
+        self.btn_next.setEnabled(False)
+        self.page_label.setText("Loading…")
+
+        # Records written elsewhere (other dialogs, cascades) make every cached page and count stale
+        if self.db.write_version != self._seen_write_version:
+            self.invalidate_page_cache()
+
+        # The sort index is a schema write, so it is made here rather than on the worker
+        self.db.ensure_sort_index(self.table_name, self.sort_column)
+
+        key = self._page_key(self.current_page)
+        self.load_worker = Worker(self._load_page, key, self._page_cache.get(key),
+                                  self.page_cursor_before(key), self._total_cache.get(key[0]))
+        self.load_worker.signals.finished.connect(lambda result: self.on_records_ready(seq, result))
+        self.load_worker.signals.failed.connect(lambda message: self.on_records_failed(seq, message))
+        QThreadPool.globalInstance().start(self.load_worker)
+
+    def _load_page(self, key: tuple, cached_records: list = None, after: tuple = None,
+                   total_records: int = None) -> tuple:
+        """Count the records (unless the count is known), fetch the (clamped) page and its
+        references; runs on a worker thread.
+        Returns (page key, total records, records, reference lookups).
+        """
+        query, sort_column, sort_order, page_size, page = key
+
         # Count total records
-        self.total_records = self.db.count_records(self.table_name)
+        if total_records is None:
+            total_records = self.count_query(query)
 
         # Calculate total pages
-        total_pages = max(1, (self.total_records + self.page_size - 1) // self.page_size)
+        total_pages = max(1, (total_records + page_size - 1) // page_size)
 
         # Ensure current page is valid
-        self.current_page = min(self.current_page, total_pages - 1)
-        self.current_page = max(0, self.current_page)
+        valid_page = max(0, min(page, total_pages - 1))
+        if valid_page != page:
+            key = (query, sort_column, sort_order, page_size, valid_page)
+            cached_records = after = None
+
+        # Load records (from the page cache when this page was prefetched)
+        records = cached_records if cached_records is not None else self._fetch_page(key, after)
+        return key, total_records, records, self.collect_references(records)
+
+    def on_records_failed(self, seq: int, message: str):
+        """Report a page that could not be loaded"""
+        if seq == self._fetch_seq:
+            self.page_label.setText(f"Failed to load records: {message}")
+
+    def on_records_ready(self, seq: int, result: tuple):
+        """Show a page loaded by load_records, unless a newer load was started since"""
+        if seq != self._fetch_seq:
+            return
 
-        # Load records
-        offset = self.current_page * self.page_size
-        records = self.db.get_records(
-            self.table_name,
-            limit=self.page_size,
-            offset=offset,
-            order_by=self.sort_column,
-            order_dir=self.sort_order
-        )
+        key, self.total_records, records, references = result
+        self._total_cache[key[0]] = self.total_records
+        self.current_page = key[-1]
+        total_pages = max(1, (self.total_records + self.page_size - 1) // self.page_size)
+        self._remember_page(key, records)
+        self._shown_key = key
+        self.install_references(references)
 
         # Populate table
-        self.records_table.setRowCount(len(records))
-
-        for row_idx, record in enumerate(records):
-            # ID column
-            id_item = QTableWidgetItem(str(record['id']))
-            id_item.setData(Qt.ItemDataRole.UserRole, record['id'])
-            self.records_table.setItem(row_idx, 0, id_item)
-
-            # Field columns (only visible fields)
-            for col_idx, field in enumerate(self.visible_fields):
-                value = record.get(field['name'], '')
-                display_value = self.format_field_value(field, value)
-
-                item = QTableWidgetItem(display_value)
-                self.records_table.setItem(row_idx, col_idx + 1, item)
+        self.populate_table(records)
 
         # Update pagination UI
         self.update_pagination_ui(total_pages)
 
-    def get_reference_display_name(self, record: dict, table_id: int) -> str:
-        """Get a meaningful display name for a referenced record"""
-        # Get fields for the referenced table
-        ref_fields = self.db.get_fields(table_id)
+        # Fetch the neighbouring pages in the background once this one is shown
+        QTimer.singleShot(0, lambda: self.prefetch_neighbor_pages(total_pages))
+
+    def populate_table(self, records: list):
+        """Show records in the table; cells are formatted lazily as they become visible"""
+        self.records_model.set_records(records)
+
+    def selected_record_id(self):
+        """ID of the record in the current row, or None when no row is selected"""
+        index = self.records_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.records_model.record_id(index.row())
+
+    def _page_key(self, page: int) -> tuple:
+        """Page cache key: everything that decides which records a page holds"""
+        return ((self.search_term, self.filter_key), self.sort_column, self.sort_order,
+                self.page_size, page)
+
+    def count_query(self, query: tuple) -> int:
+        """Count the records matching query = (search term, filter key) from a page key.
+        Takes everything from its arguments, so it can run on a worker thread.
+        """
+        search_term, filter_key = query
+        if filter_key:
+            return self.db.count_filtered_records(self.table_name, json.loads(filter_key))
+        return self.db.count_search_records(self.table_name, self.get_searchable_fields(), search_term)
+
+    def page_cursor_before(self, key: tuple):
+        """Where the page for key starts: the (sort value, id) cursor of the page before it,
+        when that page has been loaded
+        """
+        page = key[-1]
+        if page == 0:
+            return None
+        return self._page_cursors.get(key[:-1] + (page - 1,))
+
+    def _fetch_page(self, key: tuple, after: tuple = None) -> list:
+        """Fetch one page of records: filter results, search results or all records.
+        With the previous page's cursor (after) the page is read by keyset instead of OFFSET.
+        Takes everything from its arguments, so it can run on a worker thread.
+        """
+        (search_term, filter_key), sort_column, sort_order, page_size, page = key
+        # Only the columns the list uses (plus the sort column, which page cursors read)
+        columns = self.list_columns if sort_column in self.list_columns else self.list_columns + [sort_column]
+        columns = ', '.join(columns)
+        if filter_key:
+            return self.db.filter_records(
+                self.table_name,
+                json.loads(filter_key),
+                limit=page_size,
+                offset=page * page_size,
+                order_by=sort_column,
+                order_dir=sort_order,
+                columns=columns,
+                after=after
+            )
+        return self.db.search_records(
+            self.table_name,
+            self.get_searchable_fields(),
+            search_term,
+            limit=page_size,
+            offset=page * page_size,
+            order_by=sort_column,
+            order_dir=sort_order,
+            columns=columns,
+            after=after
+        )
 
-        # Try to find a good display field (text, email, or first string field)
-        for ref_field in ref_fields:
-            field_type = ref_field['field_type']
-            field_name = ref_field['name']
+    def _remember_page(self, key: tuple, records: list):
+        """Store a page in the cache, evicting the least recently used ones"""
+        self._page_cache[key] = records
+        self._page_cache.move_to_end(key)
+        if records:
+            last = records[-1]
+            self._page_cursors[key] = (last.get(key[1]), last['id'])
+        while len(self._page_cache) > PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+
+    def invalidate_page_cache(self, count_changed: bool = True):
+        """Drop cached pages after records were added, changed or deleted.
+        count_changed is False for edits, which keep the total record count.
+        """
+        self._page_cache.clear()
+        # Formatted reference cells may name a record that changed (tables can reference themselves)
+        self.records_model.clear_display_cache()
+        self._page_cursors.clear()
+        self._page_cache_generation += 1
+        self._seen_write_version = self.db.write_version
+        # An edit can change which records match a search, but not how many records there are
+        total = self._total_cache.get(('', ''))
+        self._total_cache.clear()
+        if not count_changed and total is not None:
+            self._total_cache[('', '')] = total
+
+    def prefetch_neighbor_pages(self, total_pages: int):
+        """Load the pages before and after the current one on a worker thread"""
+        keys = [self._page_key(page) for page in (self.current_page + 1, self.current_page - 1)
+                if 0 <= page < total_pages]
+        jobs = [(key, self.page_cursor_before(key)) for key in keys if key not in self._page_cache]
+        if not jobs:
+            return
 
-            # Skip non-text fields and ID
-            if field_name == 'id':
-                continue
+        generation = self._page_cache_generation
+        self.prefetch_worker = Worker(lambda: [(key, self._fetch_page(key, after)) for key, after in jobs])
+        self.prefetch_worker.signals.finished.connect(
+            lambda pages: self.on_pages_prefetched(pages, generation)
+        )
+        QThreadPool.globalInstance().start(self.prefetch_worker)
 
-            # Prioritize text-like fields
-            if field_type in ['text', 'email', 'phone', 'url']:
-                value = record.get(field_name)
-                if value:
-                    return str(value)
+    def on_pages_prefetched(self, pages: list, generation: int):
+        """Cache pages fetched in the background, unless records changed meanwhile"""
+        if generation != self._page_cache_generation:
+            return
+        for key, records in pages:
+            if key not in self._page_cache:
+                self._remember_page(key, records)
+                # Keep the page being shown the most recently used
+                current_key = self._page_key(self.current_page)
+                if current_key in self._page_cache:
+                    self._page_cache.move_to_end(current_key)
+
+    def get_ref_table(self, table_id: int):
+        """Get a referenced table's metadata (cached since load_fields)"""
+        if table_id not in self._ref_table_cache:
+            self._ref_table_cache[table_id] = self.db.get_table(table_id)
+        return self._ref_table_cache[table_id]
+
+    def get_ref_record(self, ref_table: dict, record_id, ref_records: dict = None):
+        """Get a referenced record from the prefetched batch (ref_records, by default the
+        page's), querying only if it was not prefetched
+        """
+        if ref_records is None:
+            ref_records = self._ref_records
+        records = ref_records.setdefault(ref_table['id'], {})
+        if record_id not in records:
+            records[record_id] = self.db.get_record(ref_table['name'], record_id)
+        return records[record_id]
+
+    def collect_references(self, records: list, limit: int = MULTIREF_PREVIEW_LIMIT) -> dict:
+        """Load every record referenced by records, one batched query per referenced table;
+        for multireference values only the first limit IDs (all of them if limit is None).
+        Returns {ref_table_id: {id: record}}. Only reads view state set up by load_fields,
+        so it can run on a worker thread; see install_references.
+        """
+        ref_records = {}
+        ids_by_table = {}
+
+        for field in self.fields:
+            field_type = field['field_type']
+            ref_table_id = field.get('reference_table_id')
+            if field_type not in ('reference', 'multireference') or not ref_table_id:
+                continue
 
-        # If no text field found, try any field with a value
-        for ref_field in ref_fields:
-            field_name = ref_field['name']
-            if field_name != 'id':
-                value = record.get(field_name)
-                if value:
-                    return str(value)
+            ids = ids_by_table.setdefault(ref_table_id, [])
+            for record in records:
+                value = record.get(field['name'])
+                if not value:
+                    continue
+                if field_type == 'reference':
+                    ids.append(value)
+                    continue
+                try:
+                    parsed = fast_json.loads(value) if isinstance(value, str) else value
+                except ValueError:
+                    continue
+                if isinstance(parsed, list):
+                    ids.extend(rid for rid in parsed[:limit] if isinstance(rid, (int, str)))
+
+        for ref_table_id, ids in ids_by_table.items():
+            ref_table = self._ref_table_cache.get(ref_table_id)
+            if ref_table and ids:
+                ref_records[ref_table_id] = self.db.get_records_bulk(ref_table['name'], ids)
+
+        return ref_records
+
+    def install_references(self, ref_records: dict):
+        """Make records from collect_references the ones format_field_value uses"""
+        self._ref_records = ref_records
+
+    @staticmethod
+    def resolve_display_fields(ref_fields: list) -> tuple:
+        """Columns to try, in order, for a referenced record's display name:
+        text-like fields first, then any other field
+        """
+        # Prioritize text-like fields, skipping the ID
+        text_fields = [f['name'] for f in ref_fields
+                       if f['name'] != 'id' and f['field_type'] in ('text', 'email', 'phone', 'url')]
+        other_fields = [f['name'] for f in ref_fields
+                        if f['name'] != 'id' and f['name'] not in text_fields]
+        return tuple(text_fields + other_fields)
+
+    def get_reference_display_name(self, record: dict, display_fields: tuple) -> str:
+        """Get a meaningful display name for a referenced record"""
+        for field_name in display_fields:
+            value = record.get(field_name)
+            if value:
+                return str(value)
 
         # Fallback to ID
         return f"ID: {record['id']}"
 
-    def format_field_value(self, field: dict, value) -> str:
-        """Format field value for display"""
+    def format_field_value(self, field: dict, value, limit: int = MULTIREF_PREVIEW_LIMIT,
+                           ref_records: dict = None) -> str:
+        """Format field value for display; a multireference value names at most limit
+        records (all of them if limit is None). References are looked up in ref_records
+        (from collect_references), by default the ones loaded for the page.
+        """
         if value is None or value == '':
             return ''
 
         field_type = field['field_type']
 
-        if field_type == 'boolean':
-            return 'Yes' if value else 'No'
-        elif field_type == 'multiselect':
-            try:
-                items = json.loads(value) if isinstance(value, str) else value
-                return ', '.join(items) if items else ''
-            except:
-                return str(value)
-        elif field_type in ['image', 'file']:
-            return '📎 ' + str(value).split('/')[-1] if value else ''
-        elif field_type == 'reference':
+        if field_type == 'reference':
             if not value:
                 return ''
             # Get the referenced record and display the appropriate field
             if field.get('reference_table_id'):
-                ref_table = self.db.get_table(field['reference_table_id'])
+                ref_table = self.get_ref_table(field['reference_table_id'])
                 if ref_table:
-                    ref_record = self.db.get_record(ref_table['name'], value)
+                    ref_record = self.get_ref_record(ref_table, value, ref_records)
                     if ref_record:
                         display_field = field.get('reference_display_field')
                         if display_field and display_field in ref_record:
                             return str(ref_record[display_field])
                         # Fallback to auto-detection
-                        return self.get_reference_display_name(ref_record, field['reference_table_id'])
+                        return self.get_reference_display_name(
+                            ref_record, self.reference_display_fields.get(field['name'], ())
+                        )
             return f"ID: {value}"
         elif field_type == 'multireference':
             if not value:
                 return ''
             try:
-                ids = json.loads(value) if isinstance(value, str) else value
+                ids = fast_json.loads(value) if isinstance(value, str) else value
                 if not ids:
                     return ''
+                # Only the first few are named; the rest are counted
+                more = f" (+{len(ids) - limit} more)" if limit is not None and len(ids) > limit else ''
+                ids = ids[:limit]
                 # Get referenced records and display their values
                 if field.get('reference_table_id'):
-                    ref_table = self.db.get_table(field['reference_table_id'])
+                    ref_table = self.get_ref_table(field['reference_table_id'])
                     if ref_table:
                         display_names = []
                         for record_id in ids:
-                            ref_record = self.db.get_record(ref_table['name'], record_id)
+                            ref_record = self.get_ref_record(ref_table, record_id, ref_records)
                             if ref_record:
                                 display_field = field.get('reference_display_field')
                                 if display_field and display_field in ref_record:
                                     display_names.append(str(ref_record[display_field]))
                                 else:
                                     # Fallback to auto-detection
-                                    display_names.append(self.get_reference_display_name(ref_record, field['reference_table_id']))
-                        return ', '.join(display_names) if display_names else ''
-                return f"IDs: {', '.join(map(str, ids))}"
+                                    display_names.append(self.get_reference_display_name(
+                                        ref_record, self.reference_display_fields.get(field['name'], ())
+                                    ))
+                        return ', '.join(display_names) + more if display_names else ''
+                return f"IDs: {', '.join(map(str, ids))}{more}"
+            except:
+                return str(value)
+
+        return self.format_cached_value(field_type, value)
+
+    def make_formatter(self, field: dict):
+        """Formatter(value) -> display text for one field's column"""
+        if field['field_type'] in ('reference', 'multireference'):
+            return partial(self.format_field_value, field)
+        return partial(self.format_cached_value, field['field_type'])
+
+    def format_cached_value(self, field_type: str, value) -> str:
+        """Format a value that needs no reference lookups, from the cache when seen before"""
+        if value is None or value == '':
+            return ''
+
+        # These types depend only on the value, so repeated values are formatted once
+        key = (field_type, type(value), value)
+        text = self._format_cache.get(key)
+        if text is None:
+            if len(self._format_cache) >= FORMAT_CACHE_SIZE:
+                self._format_cache.clear()
+            text = self._format_cache[key] = self.format_plain_value(field_type, value)
+        return text
+
+    @staticmethod
+    def format_plain_value(field_type: str, value) -> str:
+        """Format a value whose display needs no reference lookups"""
+        if field_type == 'boolean':
+            return 'Yes' if value else 'No'
+        elif field_type == 'multiselect':
+            try:
+                items = fast_json.loads(value) if isinstance(value, str) else value
+                return ', '.join(items) if items else ''
             except:
                 return str(value)
+        elif field_type in ['image', 'file']:
+            return '📎 ' + str(value).split('/')[-1] if value else ''
         else:
             return str(value)
 
     def update_pagination_ui(self, total_pages: int):
         """Update pagination controls"""
         current_display = self.current_page + 1
-        self.page_label.setText(f"Page {current_display} of {total_pages} ({self.total_records} records)")
+        if self.active_filters:
+            filter_count = len(self.active_filters)
+            self.page_label.setText(
+                f"Page {current_display} of {total_pages} ({self.total_records} results, "
+                f"{filter_count} filter{'s' if filter_count > 1 else ''} active)"
+            )
+        elif self.search_term:
+            self.page_label.setText(f"Page {current_display} of {total_pages} ({self.total_records} results found)")
+        else:
+            self.page_label.setText(f"Page {current_display} of {total_pages} ({self.total_records} records)")
 
         self.btn_prev.setEnabled(self.current_page > 0)
         self.btn_next.setEnabled(self.current_page < total_pages - 1)
@@ -293,13 +740,42 @@ class RecordView(QWidget):
 
         # Toggle sort order if same column
         if self.sort_column == column_name:
+            shown_key = self._page_key(self.current_page)
             self.sort_order = 'DESC' if self.sort_order == 'ASC' else 'ASC'
+            # When every record is on screen, the other direction is the same rows reversed
+            # (ties are broken by id in the sort direction too)
+            if shown_key == self._shown_key and self.total_records <= self.page_size:
+                self.reverse_shown_records()
+                return
         else:
+            shown_key = self._page_key(self.current_page)
             self.sort_column = column_name
             self.sort_order = 'ASC'
+            # Likewise a new sort column only reorders the rows when they are all on screen
+            if (shown_key == self._shown_key and self.total_records <= self.page_size
+                    and all(column_name in record for record in self.records_model.records)):
+                self.sort_shown_records()
+                return
 
         self.load_records()
 
+    def reverse_shown_records(self):
+        """Show the current page in the opposite order without querying the database"""
+        # Drop any page load still in flight
+        self._fetch_seq += 1
+        key = self._page_key(self.current_page)
+        self._remember_page(key, self.records_model.reverse_records())
+        self._shown_key = key
+
+    def sort_shown_records(self):
+        """Sort the current page in memory by the new sort column instead of re-querying"""
+        # Drop any page load still in flight
+        self._fetch_seq += 1
+        key = self._page_key(self.current_page)
+        self._remember_page(key, self.records_model.sort_records(
+            self.sort_column, self.sort_order == 'DESC'))
+        self._shown_key = key
+
     def previous_page(self):
         """Go to previous page"""
         if self.current_page > 0:
@@ -319,47 +795,39 @@ class RecordView(QWidget):
         self.current_page = 0
         self.load_records()
 
-    def search_records(self):
-        """Search records"""
+    def on_search_text_changed(self):
+        """Restart the debounce timer on every keystroke"""
+        self.search_debounce.start()
+
+    def launch_search(self):
+        """Run the search for the text typed so far, if it changed"""
         search_term = self.search_input.text().strip()
-        if not search_term:
-            self.load_records()
+        if search_term == self.search_term or not self.get_searchable_fields():
             return
+        self.search_records()
 
-        # Search across all text-based fields
-        searchable_fields = [f['name'] for f in self.fields
-                            if f['field_type'] in ['text', 'email', 'url', 'phone', 'richtext']]
-
-        if not searchable_fields:
+    def search_records(self):
+        """Search records"""
+        self.search_debounce.stop()
+        search_term = self.search_input.text().strip()
+        if search_term and not self.get_searchable_fields():
             QMessageBox.information(self, "Search", "No searchable fields in this table")
             return
 
-        records = self.db.search_records(self.table_name, searchable_fields, search_term)
-
-        # Display results
-        self.records_table.setRowCount(len(records))
-
-        for row_idx, record in enumerate(records):
-            id_item = QTableWidgetItem(str(record['id']))
-            id_item.setData(Qt.ItemDataRole.UserRole, record['id'])
-            self.records_table.setItem(row_idx, 0, id_item)
-
-            for col_idx, field in enumerate(self.fields):
-                value = record.get(field['name'], '')
-                display_value = self.format_field_value(field, value)
-
-                item = QTableWidgetItem(display_value)
-                self.records_table.setItem(row_idx, col_idx + 1, item)
-
-        # Disable pagination during search
-        self.btn_prev.setEnabled(False)
-        self.btn_next.setEnabled(False)
-        self.page_label.setText(f"{len(records)} results found")
+        # Results are paged through load_records like the full list; a search replaces filters
+        self.search_term = search_term
+        self.active_filters = {}
+        self.filter_key = ''
+        self.current_page = 0
+        self.load_records()
 
     def clear_search(self):
         """Clear search and reload all records"""
         self.search_input.clear()
+        self.search_debounce.stop()
+        self.search_term = ''
         self.active_filters = {}
+        self.filter_key = ''
         self.current_page = 0
         self.load_records()
 
@@ -373,37 +841,20 @@ class RecordView(QWidget):
             self.apply_filters()
 
     def apply_filters(self):
-        """Apply active filters to records"""
+        """Apply active filters to records; results are paged through load_records like the full list"""
         if not self.active_filters:
+            self.filter_key = ''
             self.load_records()
             return
 
         # Clear search input when using filters
         self.search_input.clear()
+        self.search_debounce.stop()
+        self.search_term = ''
 
-        # Get filtered records
-        records = self.db.filter_records(self.table_name, self.active_filters)
-
-        # Display results
-        self.records_table.setRowCount(len(records))
-
-        for row_idx, record in enumerate(records):
-            id_item = QTableWidgetItem(str(record['id']))
-            id_item.setData(Qt.ItemDataRole.UserRole, record['id'])
-            self.records_table.setItem(row_idx, 0, id_item)
-
-            for col_idx, field in enumerate(self.visible_fields):
-                value = record.get(field['name'], '')
-                display_value = self.format_field_value(field, value)
-
-                item = QTableWidgetItem(display_value)
-                self.records_table.setItem(row_idx, col_idx + 1, item)
-
-        # Disable pagination during filter
-        self.btn_prev.setEnabled(False)
-        self.btn_next.setEnabled(False)
-        filter_count = len(self.active_filters)
-        self.page_label.setText(f"{len(records)} results ({filter_count} filter{'s' if filter_count > 1 else ''} active)")
+        self.filter_key = json.dumps(self.active_filters, sort_keys=True)
+        self.current_page = 0
+        self.load_records()
 
     def add_record(self):
         """Add a new record"""
@@ -412,31 +863,29 @@ class RecordView(QWidget):
         dialog = RecordDialog(self.db, self.storage, self.table_id,
                              self.table_name, self.fields, parent=self)
         if dialog.exec():
+            self.invalidate_page_cache()
             self.load_records()
 
     def edit_record(self):
         """Edit the selected record"""
-        current_row = self.records_table.currentRow()
-        if current_row < 0:
+        record_id = self.selected_record_id()
+        if record_id is None:
             return
 
-        record_id = self.records_table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
-
         from record_dialog import RecordDialog
 
         dialog = RecordDialog(self.db, self.storage, self.table_id,
                              self.table_name, self.fields, record_id, parent=self)
         if dialog.exec():
+            self.invalidate_page_cache(count_changed=False)
             self.load_records()
 
     def preview_record(self):
         """Preview the selected record"""
-        current_row = self.records_table.currentRow()
-        if current_row < 0:
+        record_id = self.selected_record_id()
+        if record_id is None:
             return
 
-        record_id = self.records_table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
-
         from record_preview import RecordPreviewDialog
 
         # Get table display name
@@ -452,12 +901,10 @@ class RecordView(QWidget):
 
     def delete_record(self):
         """Delete the selected record"""
-        current_row = self.records_table.currentRow()
-        if current_row < 0:
+        record_id = self.selected_record_id()
+        if record_id is None:
             return
 
-        record_id = self.records_table.item(current_row, 0).data(Qt.ItemDataRole.UserRole)
-
         reply = QMessageBox.question(
             self,
             "Confirm Delete",
@@ -468,34 +915,40 @@ class RecordView(QWidget):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            # Delete files associated with this record
-            self.storage.delete_record_files(self.table_name, record_id)
+            # Delete the record and those cascading from it in one transaction
+            deleted = self.db.delete_record(self.table_name, record_id)
 
-            # Delete record
-            self.db.delete_record(self.table_name, record_id)
+            # Delete their files in the background
+            self.delete_files_worker = Worker(
+                lambda: [self.storage.delete_record_files(table_name, deleted_id)
+                         for table_name, deleted_id in deleted]
+            )
+            QThreadPool.globalInstance().start(self.delete_files_worker)
 
+            self.invalidate_page_cache()
             self.load_records()
 
     def export_to_csv(self):
-        """Export current records to CSV file"""
-        # Get the current records to export
+        """Export current records to CSV file, written on a worker thread"""
+        # Get the current records to export, streamed in chunks
         if self.active_filters:
             # Export filtered records
-            records = self.db.filter_records(self.table_name, self.active_filters)
+            total = self.db.count_filtered_records(self.table_name, self.active_filters)
+            chunks = self.db.iter_filtered_records(self.table_name, self.active_filters)
             default_filename = f"{self.table_name}_filtered_export.csv"
-        elif self.search_input.text().strip():
+        elif self.search_term:
             # Export search results
-            search_term = self.search_input.text().strip()
-            searchable_fields = [f['name'] for f in self.fields
-                                if f['field_type'] in ['text', 'email', 'url', 'phone', 'richtext']]
-            records = self.db.search_records(self.table_name, searchable_fields, search_term)
+            searchable_fields = self.get_searchable_fields()
+            total = self.db.count_search_records(self.table_name, searchable_fields, self.search_term)
+            chunks = self.db.iter_search_records(self.table_name, searchable_fields, self.search_term)
             default_filename = f"{self.table_name}_search_export.csv"
         else:
             # Export all records
-            records = self.db.get_records(self.table_name, limit=999999)
+            total = self.db.count_records(self.table_name)
+            chunks = self.db.iter_records(self.table_name)
             default_filename = f"{self.table_name}_export.csv"
 
-        if not records:
+        if not total:
             QMessageBox.information(self, "Export", "No records to export")
             return
 
@@ -510,38 +963,80 @@ class RecordView(QWidget):
         if not file_path:
             return
 
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                # Use visible fields for export
-                field_names = ['ID'] + [f['display_name'] for f in self.visible_fields]
-                writer = csv.DictWriter(csvfile, fieldnames=field_names)
-
-                # Write header
-                writer.writeheader()
-
-                # Write records
-                for record in records:
-                    row = {'ID': record['id']}
-                    for field in self.visible_fields:
-                        value = record.get(field['name'], '')
-                        # Format the value for CSV
-                        display_value = self.format_field_value(field, value)
-                        row[field['display_name']] = display_value
-
-                    writer.writerow(row)
+        self.btn_export.setEnabled(False)
+        self.export_progress = QProgressDialog("Exporting records...", "Cancel", 0, total, self)
+        self.export_progress.setWindowTitle("Export to CSV")
+        self.export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.export_progress.setMinimumDuration(500)
+
+        self.export_worker = ProgressWorker(self.write_csv, file_path, chunks, total)
+        self.export_worker.signals.progress.connect(self.export_progress.setValue)
+        self.export_worker.signals.finished.connect(lambda exported: self.on_csv_exported(file_path, exported))
+        self.export_worker.signals.failed.connect(self.on_csv_export_failed)
+        self.export_progress.canceled.connect(self.export_worker.cancel)
+        QThreadPool.globalInstance().start(self.export_worker)
+
+    def write_csv(self, file_path: str, chunks, total: int, progress=None, cancelled=None):
+        """Write records from chunks to a CSV file; runs on a worker thread.
+        Returns the number of records written, or None if cancelled (the file is removed).
+        """
+        exported = 0
+        # Use visible fields for export, in a fixed column order
+        fields = self.visible_fields
+        field_names = [f['name'] for f in fields]
+        with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+
+            # Write header
+            writer.writerow(['ID'] + [f['display_name'] for f in fields])
+
+            # Write records a chunk at a time
+            for records in chunks:
+                if cancelled and cancelled():
+                    break
+
+                # Exported cells list every referenced record
+                ref_records = self.collect_references(records, limit=None)
+
+                writer.writerows(
+                    [record['id']] + [
+                        self.format_field_value(field, record.get(name, ''), limit=None,
+                                                ref_records=ref_records)
+                        for field, name in zip(fields, field_names)
+                    ]
+                    for record in records
+                )
+                exported += len(records)
+                if progress:
+                    progress(min(exported, total), total)
+
+        if cancelled and cancelled():
+            os.remove(file_path)
+            return None
+        return exported
+
+    def on_csv_exported(self, file_path: str, exported):
+        """Close the progress dialog and report the finished export"""
+        self.export_progress.close()
+        self.btn_export.setEnabled(True)
+        if exported is None:
+            return
 
-            QMessageBox.information(
-                self,
-                "Export Successful",
-                f"Exported {len(records)} record(s) to:\n{file_path}"
-            )
+        QMessageBox.information(
+            self,
+            "Export Successful",
+            f"Exported {exported} record(s) to:\n{file_path}"
+        )
 
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Export Failed",
-                f"Failed to export records:\n{str(e)}"
-            )
+    def on_csv_export_failed(self, message: str):
+        """Close the progress dialog and report the error"""
+        self.export_progress.close()
+        self.btn_export.setEnabled(True)
+        QMessageBox.critical(
+            self,
+            "Export Failed",
+            f"Failed to export records:\n{message}"
+        )
 
     def generate_report(self):
         """Generate a custom report"""
@@ -665,4 +1160,5 @@ class RecordView(QWidget):
 
         if dialog.exec():
             # Reload records after import
+            self.invalidate_page_cache()
             self.load_records()
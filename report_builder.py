@@ -2,7 +2,7 @@
 Report builder for creating custom reports with field selection and grouping
 """
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QLabel, QListWidget, QGroupBox, QComboBox,
+                             QLabel, QListWidget, QListWidgetItem, QGroupBox, QComboBox,
                              QCheckBox, QLineEdit, QAbstractItemView, QMessageBox)
 from PyQt6.QtCore import Qt
 from database import DatabaseManager
@@ -61,11 +61,13 @@ class ReportBuilderDialog(QDialog):
         # Add all fields except ID
         for field in self.fields:
             if field['name'] != 'id':
-                item_text = f"{field['display_name']} ({field['field_type']})"
-                self.fields_list.addItem(item_text)
+                item = QListWidgetItem(f"{field['display_name']} ({field['field_type']})")
+                # The field name travels with the item, so nothing is parsed back from its text
+                item.setData(Qt.ItemDataRole.UserRole, field['name'])
+                self.fields_list.addItem(item)
                 # Select by default if show_in_list is True
                 if field.get('show_in_list', True):
-                    self.fields_list.item(self.fields_list.count() - 1).setSelected(True)
+                    item.setSelected(True)
 
         fields_layout.addWidget(self.fields_list)
 
@@ -145,8 +147,8 @@ class ReportBuilderDialog(QDialog):
 
     def select_all_fields(self):
         """Select all fields"""
-        for i in range(self.fields_list.count()):
-            self.fields_list.item(i).setSelected(True)
+        # One selection change (and one itemSelectionChanged) rather than one per item
+        self.fields_list.selectAll()
 
     def select_no_fields(self):
         """Deselect all fields"""
@@ -162,15 +164,7 @@ class ReportBuilderDialog(QDialog):
             return
 
         # Build list of selected field names
-        self.selected_fields = []
-        for item in selected_items:
-            # Extract field name from item text (remove the type suffix)
-            field_display = item.text().split(' (')[0]
-            # Find the field by display name
-            for field in self.fields:
-                if field['display_name'] == field_display:
-                    self.selected_fields.append(field['name'])
-                    break
+        self.selected_fields = [item.data(Qt.ItemDataRole.UserRole) for item in selected_items]
 
         # Get other options
         self.report_title = self.title_input.text().strip() or f"{self.table_display_name} Report"
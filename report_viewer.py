@@ -3,15 +3,99 @@ Report viewer for displaying and printing custom reports
 """
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
                              QTextEdit, QMessageBox)
-from PyQt6.QtCore import Qt, QUrl, QMarginsF
-from PyQt6.QtGui import QFont, QPageLayout, QPageSize
+from PyQt6.QtCore import Qt, QUrl, QMarginsF, QThreadPool
+from PyQt6.QtGui import QFont, QPageLayout, QPageSize, QTextDocument
 from PyQt6.QtPrintSupport import QPrintDialog, QPrinter
 from database import DatabaseManager
 from storage import StorageManager
+from workers import Worker
+from collections import OrderedDict
 from datetime import datetime
+from io import StringIO
+from string import Template
+import fast_json
+import html
 import json
 
 
+# Field types stored as JSON lists
+_JSON_LIST_TYPES = frozenset({'multiselect', 'multireference'})
+
+# Field types whose formatted values never contain HTML special characters
+_PLAIN_FIELD_TYPES = frozenset({'number', 'boolean', 'date', 'image', 'file'})
+
+# Generated reports kept for reopening while no record has changed, least recently used dropped first:
+# at most this many, holding at most this many characters of HTML in all (larger reports are not kept)
+REPORT_CACHE_SIZE = 8
+REPORT_CACHE_MAX_CHARS = 4_000_000
+
+# Report page skeleton: styles and title block, then the closing tags
+_REPORT_HEADER = Template("""
+<html>
+<head>
+    <style>
+        body { font-family: 'DejaVu Sans', Arial, sans-serif; padding: 16px; color: #222; font-size: 11pt; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        h1 { color: #222; border-bottom: 3px solid #444; padding-bottom: 10px; margin-bottom: 10px; font-size: 22pt; }
+        .report-meta { margin-bottom: 20px; color: #666; font-size: 10pt; }
+        .section-title { font-size: 14pt; font-weight: bold; color: #333; margin: 20px 0 10px 0; padding: 5px 0; border-bottom: 2px solid #888; }
+        table { width: 100%; border-collapse: collapse; margin: 10px 0; page-break-inside: auto; }
+        th { background: #f5f5f5; padding: 8px; text-align: left; border: 1px solid #ddd; font-weight: bold; font-size: 10pt; }
+        td { padding: 6px 8px; border: 1px solid #e0e0e0; font-size: 10pt; }
+        tr { page-break-inside: avoid; page-break-after: auto; }
+        tr:nth-child(even) { background: #fafafa; }
+        .summary { background: #f0f0f0; padding: 10px; margin: 15px 0; border-left: 4px solid #666; }
+        .summary-title { font-weight: bold; margin-bottom: 5px; }
+        .group-header { background: #e8e8e8; font-weight: bold; padding: 8px; margin-top: 15px; border-left: 5px solid #555; }
+        @media print {
+            body { padding: 0; font-size: 10pt; }
+            .no-print { display: none; }
+            h1 { font-size: 20pt; }
+            th, td { font-size: 9pt; padding: 4px 6px; }
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>$title</h1>
+        <div class="report-meta">
+            Table: $table_display_name<br>
+            Generated: $generated<br>
+            Total Records: $total_records
+        </div>
+""")
+
+_REPORT_FOOTER = """
+    </div>
+</body>
+</html>
+"""
+
+# report_cache_key() -> report HTML, shared by all report dialogs. The generation time is
+# left as this marker and filled in each time the HTML is shown (values are escaped, so
+# the marker cannot come from the data)
+_report_cache = OrderedDict()
+_GENERATED_MARK = '<!--generated-->'
+
+
+def clear_report_cache():
+    """Forget all generated reports, e.g. when their database is closed"""
+    _report_cache.clear()
+
+
+def _apply_print_defaults(printer: QPrinter):
+    """Set high quality output on an A4 portrait page with 15 unit margins"""
+    try:
+        printer.setResolution(300)
+        layout = printer.pageLayout()
+        layout.setOrientation(QPageLayout.Orientation.Portrait)
+        layout.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+        layout.setMargins(QMarginsF(15, 15, 15, 15))
+        printer.setPageLayout(layout)
+    except Exception:
+        pass
+
+
 class ReportViewerDialog(QDialog):
     """Dialog for viewing and printing reports"""
 
@@ -26,6 +110,16 @@ class ReportViewerDialog(QDialog):
         self.table_display_name = table_display_name
         self.fields = fields
         self.config = config
+        self._field_by_name = {f['name']: f for f in fields}
+        # Referenced records loaded for the report: {(ref_table_id, record_id): record}
+        self._ref_records = {}
+        # Copy of the report paginated for the printer page, shared by Print and Export PDF
+        self._print_doc = None
+        # Table/field metadata does not change while the dialog is open
+        self._table_cache = {}
+        self._fields_cache = {}
+        # (field name, value type, value) -> formatted HTML, for the report being generated
+        self._format_cache = {}
 
         self.setWindowTitle(f"Report: {config['title']}")
         self.resize(900, 700)
@@ -47,13 +141,13 @@ class ReportViewerDialog(QDialog):
         # Buttons
         btn_layout = QHBoxLayout()
 
-        btn_print = QPushButton("Print")
-        btn_print.clicked.connect(self.print_report)
-        btn_layout.addWidget(btn_print)
+        self.btn_print = QPushButton("Print")
+        self.btn_print.clicked.connect(self.print_report)
+        btn_layout.addWidget(self.btn_print)
 
-        btn_export_pdf = QPushButton("Export PDF")
-        btn_export_pdf.clicked.connect(self.export_pdf)
-        btn_layout.addWidget(btn_export_pdf)
+        self.btn_export_pdf = QPushButton("Export PDF")
+        self.btn_export_pdf.clicked.connect(self.export_pdf)
+        btn_layout.addWidget(self.btn_export_pdf)
 
         btn_layout.addStretch()
 
@@ -66,12 +160,89 @@ class ReportViewerDialog(QDialog):
 
     def get_field_by_name(self, field_name: str) -> dict:
         """Get field metadata by name"""
-        for field in self.fields:
-            if field['name'] == field_name:
-                return field
-        return None
+        return self._field_by_name.get(field_name)
+
+    def get_cached_table(self, table_id: int) -> dict:
+        """Get table metadata, querying the database once per table"""
+        if table_id not in self._table_cache:
+            self._table_cache[table_id] = self.db.get_table(table_id)
+        return self._table_cache[table_id]
+
+    def get_cached_fields(self, table_id: int) -> list:
+        """Get a table's fields, querying the database once per table"""
+        if table_id not in self._fields_cache:
+            self._fields_cache[table_id] = self.db.get_fields(table_id)
+        return self._fields_cache[table_id]
+
+    @staticmethod
+    def decode_json_fields(fields: list, records: list):
+        """Decode multiselect/multireference values in place, once per record.
+        Values that are not valid JSON lists are left as their original string.
+        """
+        names = [f['name'] for f in fields if f['field_type'] in _JSON_LIST_TYPES]
+        for record in records:
+            for name in names:
+                value = record.get(name)
+                if isinstance(value, str) and value:
+                    try:
+                        decoded = fast_json.loads(value)
+                    except ValueError:
+                        continue
+                    if isinstance(decoded, list):
+                        record[name] = decoded
+
+    def prefetch_references(self, fields: list, records: list):
+        """Load every record the reference fields point to, one batched query per referenced table"""
+        ids_by_table = {}
+        for field in fields:
+            ref_table_id = field.get('reference_table_id')
+            if field['field_type'] not in ('reference', 'multireference') or not ref_table_id:
+                continue
+
+            ids = ids_by_table.setdefault(ref_table_id, [])
+            for record in records:
+                value = record.get(field['name'])
+                if not value:
+                    continue
+                if field['field_type'] == 'reference':
+                    ids.append(value)
+                else:
+                    try:
+                        ref_ids = fast_json.loads(value) if isinstance(value, str) else value
+                    except ValueError:
+                        continue
+                    if isinstance(ref_ids, list):
+                        ids.extend(ref_ids)
+
+        for ref_table_id, ids in ids_by_table.items():
+            ref_table = self.get_cached_table(ref_table_id)
+            missing = [rid for rid in ids if (ref_table_id, rid) not in self._ref_records]
+            if ref_table and missing:
+                for rid, ref_record in self.db.get_records_bulk(ref_table['name'], missing).items():
+                    self._ref_records[(ref_table_id, rid)] = ref_record
 
     def format_field_value(self, field: dict, value) -> str:
+        """Format field value as report HTML (escaped), formatting each distinct value of a field once"""
+        # The type keeps e.g. 1 and 1.0 apart, which format differently
+        key = (field['name'], type(value), tuple(value) if type(value) is list else value)
+        try:
+            return self._format_cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable value
+            return self._escape_value(field, self._format_value(field, value))
+        text = self._format_cache[key] = self._escape_value(field, self._format_value(field, value))
+        return text
+
+    @staticmethod
+    def _escape_value(field: dict, text: str) -> str:
+        """HTML-escape formatted text, unless the field type cannot produce special characters"""
+        if field['field_type'] in _PLAIN_FIELD_TYPES:
+            return text
+        return html.escape(text, quote=False)
+
+    def _format_value(self, field: dict, value) -> str:
         """Format field value for display"""
         if value is None or value == '':
             return ''
@@ -83,7 +254,7 @@ class ReportViewerDialog(QDialog):
 
         elif field_type == 'multiselect':
             try:
-                items = json.loads(value) if isinstance(value, str) else value
+                items = fast_json.loads(value) if isinstance(value, str) else value
                 return ', '.join(items) if items else ''
             except:
                 return str(value)
@@ -92,15 +263,15 @@ class ReportViewerDialog(QDialog):
             if value:
                 ref_table_id = field.get('reference_table_id')
                 if ref_table_id:
-                    ref_table = self.db.get_table(ref_table_id)
+                    ref_table = self.get_cached_table(ref_table_id)
                     if ref_table:
-                        ref_record = self.db.get_record(ref_table['name'], value)
+                        ref_record = self._ref_records.get((ref_table_id, value))
                         if ref_record:
                             display_field = field.get('reference_display_field')
                             if display_field and ref_record.get(display_field):
                                 return str(ref_record[display_field])
                             # Fallback to first text field
-                            ref_fields = self.db.get_fields(ref_table_id)
+                            ref_fields = self.get_cached_fields(ref_table_id)
                             for rf in ref_fields:
                                 if rf['field_type'] in ['text', 'email', 'url', 'phone'] and rf['name'] != 'id':
                                     val = ref_record.get(rf['name'])
@@ -111,15 +282,15 @@ class ReportViewerDialog(QDialog):
 
         elif field_type == 'multireference':
             try:
-                ids = json.loads(value) if isinstance(value, str) else value
+                ids = fast_json.loads(value) if isinstance(value, str) else value
                 if ids:
                     ref_table_id = field.get('reference_table_id')
                     if ref_table_id:
-                        ref_table = self.db.get_table(ref_table_id)
+                        ref_table = self.get_cached_table(ref_table_id)
                         if ref_table:
                             labels = []
                             for rid in ids:
-                                ref_record = self.db.get_record(ref_table['name'], rid)
+                                ref_record = self._ref_records.get((ref_table_id, rid))
                                 if ref_record:
                                     display_field = field.get('reference_display_field')
                                     if display_field and ref_record.get(display_field):
@@ -137,15 +308,90 @@ class ReportViewerDialog(QDialog):
         else:
             return str(value)
 
+    def report_cache_key(self) -> tuple:
+        """Everything the report's HTML depends on: the database connection (file and
+        generation, which is new on every connect) and its write version
+        (any record change, in this or a referenced table, makes a new one), the
+        report configuration and the table's field definitions
+        """
+        return (self.db.db_file, self.db.generation, self.db.write_version, self.table_name,
+                self.table_display_name, json.dumps(self.config, sort_keys=True, default=str),
+                json.dumps(self.fields, sort_keys=True, default=str))
+
     def generate_report(self):
-        """Generate the report HTML"""
-        # Get all records with sorting
+        """Show the report. Its HTML is built (unless the same report was generated since
+        records last changed) and parsed into a document on a background thread; the
+        document is shown by on_report_ready.
+        """
+        cache_key = self.report_cache_key()
+        report_html = _report_cache.get(cache_key)
+        if report_html is not None:
+            _report_cache.move_to_end(cache_key)
+        else:
+            # The report reads in sort order; the index is a schema write, so it is made
+            # here on the GUI thread rather than by the worker
+            self.db.ensure_sort_index(self.table_name, self.config.get('sort_by', 'id'))
+
+        self.report_text.setPlainText("Generating report…")
+        self.btn_print.setEnabled(False)
+        self.btn_export_pdf.setEnabled(False)
+
+        # Keep a reference so the worker (and its signals) outlive this call
+        self.report_worker = Worker(self.build_report_document, report_html,
+                                    self.report_text.font(), self.thread())
+        self.report_worker.signals.finished.connect(
+            lambda result: self.on_report_ready(result, cache_key)
+        )
+        self.report_worker.signals.failed.connect(self.on_report_failed)
+        QThreadPool.globalInstance().start(self.report_worker)
+
+    def build_report_document(self, report_html: str, font: QFont, gui_thread) -> tuple:
+        """Build the report HTML if report_html is None, and parse it into a QTextDocument
+        handed over to gui_thread, stamped with the current time. Runs on a worker thread;
+        returns (html, document), the HTML still carrying the generation time marker.
+        """
+        if report_html is None:
+            report_html = self.build_report_html()
+
+        generated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        doc = QTextDocument()
+        doc.setDefaultFont(font)
+        doc.setHtml(report_html.replace(_GENERATED_MARK, generated, 1))
+        doc.moveToThread(gui_thread)
+        return report_html, doc
+
+    def on_report_ready(self, result: tuple, cache_key: tuple):
+        """Show the report document built by the background worker and remember its HTML"""
+        report_html, doc = result
+        if len(report_html) <= REPORT_CACHE_MAX_CHARS:
+            _report_cache[cache_key] = report_html
+            while (len(_report_cache) > REPORT_CACHE_SIZE
+                   or sum(map(len, _report_cache.values())) > REPORT_CACHE_MAX_CHARS):
+                _report_cache.popitem(last=False)
+
+        # The view keeps (and eventually deletes) the document it shows
+        doc.setParent(self.report_text)
+        self.report_text.setDocument(doc)
+        self._print_doc = None
+        self.btn_print.setEnabled(True)
+        self.btn_export_pdf.setEnabled(True)
+
+    def on_report_failed(self, message: str):
+        """Report a failed background report build"""
+        self.report_text.setPlainText(f"Failed to generate report: {message}")
+
+    def build_report_html(self) -> str:
+        """Build the report HTML. Runs on a worker thread, so it must not touch widgets."""
+        # Referenced records may have changed since the last report
+        self._format_cache.clear()
+        self._ref_records.clear()
+
+        # Records are read in sorted chunks and turned into rows as they come,
+        # so the whole table is never held in memory at once
         sort_by = self.config.get('sort_by', 'id')
         sort_order = self.config.get('sort_order', 'ASC')
-        records = self.db.get_records(self.table_name,
-                                      order_by=sort_by,
-                                      order_dir=sort_order,
-                                      limit=999999)
+        record_count = self.db.count_records(self.table_name)
+        chunks = self.db.iter_records(self.table_name, order_by=sort_by, order_dir=sort_order)
 
         # Build selected fields metadata
         selected_fields = []
@@ -154,178 +400,151 @@ class ReportViewerDialog(QDialog):
             if field:
                 selected_fields.append(field)
 
-        # Start HTML
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: 'DejaVu Sans', Arial, sans-serif; padding: 16px; color: #222; font-size: 11pt; }}
-                .container {{ max-width: 1200px; margin: 0 auto; }}
-                h1 {{ color: #222; border-bottom: 3px solid #444; padding-bottom: 10px; margin-bottom: 10px; font-size: 22pt; }}
-                .report-meta {{ margin-bottom: 20px; color: #666; font-size: 10pt; }}
-                .section-title {{ font-size: 14pt; font-weight: bold; color: #333; margin: 20px 0 10px 0; padding: 5px 0; border-bottom: 2px solid #888; }}
-                table {{ width: 100%; border-collapse: collapse; margin: 10px 0; page-break-inside: auto; }}
-                th {{ background: #f5f5f5; padding: 8px; text-align: left; border: 1px solid #ddd; font-weight: bold; font-size: 10pt; }}
-                td {{ padding: 6px 8px; border: 1px solid #e0e0e0; font-size: 10pt; }}
-                tr {{ page-break-inside: avoid; page-break-after: auto; }}
-                tr:nth-child(even) {{ background: #fafafa; }}
-                .summary {{ background: #f0f0f0; padding: 10px; margin: 15px 0; border-left: 4px solid #666; }}
-                .summary-title {{ font-weight: bold; margin-bottom: 5px; }}
-                .group-header {{ background: #e8e8e8; font-weight: bold; padding: 8px; margin-top: 15px; border-left: 5px solid #555; }}
-                @media print {{
-                    body {{ padding: 0; font-size: 10pt; }}
-                    .no-print {{ display: none; }}
-                    h1 {{ font-size: 20pt; }}
-                    th, td {{ font-size: 9pt; padding: 4px 6px; }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <h1>{self.config['title']}</h1>
-                <div class="report-meta">
-                    Table: {self.table_display_name}<br>
-                    Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br>
-                    Total Records: {len(records)}
-                </div>
-        """
-
-        # Group by field if specified
-        group_by_field = self.config.get('group_by')
-        if group_by_field:
-            # Group records
+        # References shown (in columns or group headers) are resolved a chunk at a time
+        group_field = self.get_field_by_name(self.config.get('group_by') or '')
+        ref_fields = selected_fields + ([group_field] if group_field else [])
+        columns = [(field, field['name']) for field in selected_fields]
+
+        # Start HTML (fragments are written to one buffer and read out once)
+        buf = StringIO()
+        buf.write(_REPORT_HEADER.substitute(
+            title=html.escape(self.config['title']),
+            table_display_name=html.escape(self.table_display_name),
+            generated=_GENERATED_MARK,
+            total_records=record_count
+        ))
+
+        # Group by field if specified (and still present)
+        if group_field:
+            # Group rows in one pass, groups in order of first appearance
             groups = {}
-            group_field = self.get_field_by_name(group_by_field)
-
-            for record in records:
-                group_value = record.get(group_by_field)
-                group_display = self.format_field_value(group_field, group_value) or '(Empty)'
-
-                if group_display not in groups:
-                    groups[group_display] = []
-                groups[group_display].append(record)
+            group_by_field = group_field['name']
+            format_value = self.format_field_value
+            format_row = self.format_row
+
+            for records in chunks:
+                self.decode_json_fields(ref_fields, records)
+                self.prefetch_references(ref_fields, records)
+                for record in records:
+                    group_display = format_value(group_field, record.get(group_by_field)) or '(Empty)'
+                    group_rows = groups.get(group_display)
+                    if group_rows is None:
+                        group_rows = groups[group_display] = []
+                    group_rows.append(format_row(columns, len(group_rows) + 1, record))
 
             # Generate grouped output
-            for group_name, group_records in groups.items():
-                html += f"""
+            for group_name, group_rows in groups.items():
+                buf.write(f"""
                 <div class="group-header">
-                    {group_field['display_name']}: {group_name} ({len(group_records)} record{'s' if len(group_records) != 1 else ''})
+                    {html.escape(group_field['display_name'])}: {group_name} ({len(group_rows)} record{'s' if len(group_rows) != 1 else ''})
                 </div>
-                """
-                html += self.generate_table(selected_fields, group_records)
+                """)
+                buf.write(self.table_head(selected_fields))
+                buf.write(''.join(group_rows))
+                buf.write("</tbody></table>")
+
+        elif not record_count:
+            buf.write("<p><em>No records to display</em></p>")
 
         else:
             # No grouping - single table
-            html += self.generate_table(selected_fields, records)
+            buf.write(self.table_head(selected_fields))
+            # Methods bound once, outside the per-row loop
+            write = buf.write
+            format_row = self.format_row
+            numbered = 0
+            for records in chunks:
+                self.decode_json_fields(ref_fields, records)
+                self.prefetch_references(ref_fields, records)
+                write(''.join([format_row(columns, idx, record)
+                               for idx, record in enumerate(records, numbered + 1)]))
+                numbered += len(records)
+            write("</tbody></table>")
 
         # Summary statistics
         if self.config.get('include_summary'):
-            html += self.generate_summary(selected_fields, records)
+            buf.write(self.generate_summary(selected_fields))
 
         # Total count
         if self.config.get('include_totals'):
-            html += f"""
+            buf.write(f"""
             <div class="summary">
                 <div class="summary-title">Report Summary</div>
-                Total Records: {len(records)}
+                Total Records: {record_count}
             </div>
-            """
+            """)
 
-        html += """
-            </div>
-        </body>
-        </html>
-        """
-
-        self.report_text.setHtml(html)
+        buf.write(_REPORT_FOOTER)
 
-    def generate_table(self, fields: list, records: list) -> str:
-        """Generate HTML table for records"""
-        if not records:
-            return "<p><em>No records to display</em></p>"
+        return buf.getvalue()
 
-        html = "<table>"
-
-        # Table header
-        html += "<thead><tr>"
-        html += "<th>#</th>"  # Row number
-        for field in fields:
-            html += f"<th>{field['display_name']}</th>"
-        html += "</tr></thead>"
-
-        # Table body
-        html += "<tbody>"
-        for idx, record in enumerate(records, 1):
-            html += "<tr>"
-            html += f"<td>{idx}</td>"
-            for field in fields:
-                value = record.get(field['name'])
-                display_value = self.format_field_value(field, value)
-                html += f"<td>{display_value}</td>"
-            html += "</tr>"
-        html += "</tbody>"
+    @staticmethod
+    def table_head(fields: list) -> str:
+        """Opening HTML of a report table, up to its body: the # column and one per field"""
+        headers = ''.join([f"<th>{html.escape(field['display_name'])}</th>" for field in fields])
+        return f"<table><thead><tr><th>#</th>{headers}</tr></thead><tbody>"
 
-        html += "</table>"
-        return html
+    def format_row(self, columns: list, idx: int, record: dict) -> str:
+        """HTML table row for a record: its number, then a cell per (field, name) column"""
+        format_value = self.format_field_value
+        cells = ''.join([f"<td>{format_value(field, record.get(name))}</td>" for field, name in columns])
+        return f"<tr><td>{idx}</td>{cells}</tr>"
 
-    def generate_summary(self, fields: list, records: list) -> str:
-        """Generate summary statistics for number fields"""
+    def generate_summary(self, fields: list) -> str:
+        """Generate summary statistics for number fields, computed by SQLite in one query"""
         number_fields = [f for f in fields if f['field_type'] == 'number']
+        if not number_fields:
+            return ""
 
-        if not number_fields or not records:
+        record_count, stats = self.db.aggregate_numbers(self.table_name,
+                                                        [f['name'] for f in number_fields])
+        if not record_count:
             return ""
 
-        html = """
+        buf = StringIO()
+        buf.write("""
         <div class="section-title">Summary Statistics</div>
         <div class="summary">
-        """
+        """)
 
         for field in number_fields:
-            values = []
-            for record in records:
-                val = record.get(field['name'])
-                if val is not None and val != '':
-                    try:
-                        values.append(float(val))
-                    except:
-                        pass
-
-            if values:
-                total = sum(values)
-                avg = total / len(values)
-                min_val = min(values)
-                max_val = max(values)
-
-                html += f"""
+            count, total, avg, min_val, max_val = stats[field['name']]
+            if count:
+                buf.write(f"""
                 <div style="margin-bottom: 10px;">
-                    <strong>{field['display_name']}:</strong><br>
+                    <strong>{html.escape(field['display_name'])}:</strong><br>
                     &nbsp;&nbsp;Sum: {total:,.2f}<br>
                     &nbsp;&nbsp;Average: {avg:,.2f}<br>
                     &nbsp;&nbsp;Min: {min_val:,.2f}<br>
                     &nbsp;&nbsp;Max: {max_val:,.2f}<br>
-                    &nbsp;&nbsp;Count: {len(values)}
+                    &nbsp;&nbsp;Count: {count}
                 </div>
-                """
+                """)
 
-        html += "</div>"
-        return html
+        buf.write("</div>")
+        return buf.getvalue()
+
+    def get_print_document(self, printer: QPrinter) -> QTextDocument:
+        """Get a copy of the report paginated for the printer's page. It is laid out once
+        and reused while the page size stays the same.
+        """
+        page_size = printer.pageRect(QPrinter.Unit.Point).size()
+        if self._print_doc is None or self._print_doc.pageSize() != page_size:
+            # A page size that matches the printer lets print() use this document's
+            # layout directly instead of making and laying out another internal copy
+            doc = self.report_text.document().clone(self)
+            doc.setPageSize(page_size)
+            self._print_doc = doc
+        return self._print_doc
 
     def print_report(self):
         """Print the report"""
         printer = QPrinter(QPrinter.PrinterMode.HighResolution)
-        try:
-            printer.setResolution(300)
-            layout = printer.pageLayout()
-            layout.setOrientation(QPageLayout.Orientation.Portrait)
-            layout.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-            layout.setMargins(QMarginsF(15, 15, 15, 15))
-            printer.setPageLayout(layout)
-        except Exception:
-            pass
+        _apply_print_defaults(printer)
 
         dialog = QPrintDialog(printer, self)
         if dialog.exec() == QPrintDialog.DialogCode.Accepted:
-            self.report_text.document().print(printer)
+            self.get_print_document(printer).print(printer)
 
     def export_pdf(self):
         """Export report to PDF"""
@@ -345,17 +564,9 @@ class ReportViewerDialog(QDialog):
             printer = QPrinter(QPrinter.PrinterMode.HighResolution)
             printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
             printer.setOutputFileName(file_path)
-            try:
-                printer.setResolution(300)
-                layout = printer.pageLayout()
-                layout.setOrientation(QPageLayout.Orientation.Portrait)
-                layout.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
-                layout.setMargins(QMarginsF(15, 15, 15, 15))
-                printer.setPageLayout(layout)
-            except Exception:
-                pass
-
-            self.report_text.document().print(printer)
+            _apply_print_defaults(printer)
+
+            self.get_print_document(printer).print(printer)
 
             QMessageBox.information(
                 self,
@@ -15,14 +15,12 @@ class StorageManager:
 
     def _ensure_base_dir(self):
         """Ensure the base storage directory exists"""
-        if not os.path.exists(self.base_dir):
-            os.makedirs(self.base_dir)
+        os.makedirs(self.base_dir, exist_ok=True)
 
     def get_record_dir(self, table_name: str, record_id: int) -> str:
         """Get the storage directory for a specific record"""
         record_dir = os.path.join(self.base_dir, table_name, str(record_id))
-        if not os.path.exists(record_dir):
-            os.makedirs(record_dir)
+        os.makedirs(record_dir, exist_ok=True)
         return record_dir
 
     def save_file(self, table_name: str, record_id: int,
@@ -31,8 +29,10 @@ class StorageManager:
         Save a file to storage
         Returns the relative path to the saved file
         """
-        if not os.path.exists(source_path):
-            raise FileNotFoundError(f"Source file not found: {source_path}")
+        try:
+            source_stat = os.stat(source_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Source file not found: {source_path}") from None
 
         record_dir = self.get_record_dir(table_name, record_id)
 
@@ -44,8 +44,10 @@ class StorageManager:
         new_filename = f"{field_name}_{original_filename}"
         dest_path = os.path.join(record_dir, new_filename)
 
-        # Copy file
-        shutil.copy2(source_path, dest_path)
+        # Copy the contents (copyfile uses the kernel's zero-copy path where it can), then
+        # keep the source's timestamps; the rest of copy2's metadata copying is not needed
+        shutil.copyfile(source_path, dest_path)
+        os.utime(dest_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
 
         # Return relative path
         return os.path.relpath(dest_path, self.base_dir)
@@ -56,22 +58,25 @@ class StorageManager:
 
     def delete_file(self, relative_path: str):
         """Delete a file from storage"""
-        abs_path = self.get_file_path(relative_path)
-        if os.path.exists(abs_path):
-            os.remove(abs_path)
+        try:
+            os.remove(self.get_file_path(relative_path))
+        except FileNotFoundError:
+            pass
 
     def delete_record_files(self, table_name: str, record_id: int):
         """Delete all files for a record"""
         record_dir = os.path.join(self.base_dir, table_name, str(record_id))
-        if os.path.exists(record_dir):
+        try:
             shutil.rmtree(record_dir)
+        except FileNotFoundError:
+            pass
 
     def get_file_size(self, relative_path: str) -> int:
         """Get file size in bytes"""
-        abs_path = self.get_file_path(relative_path)
-        if os.path.exists(abs_path):
-            return os.path.getsize(abs_path)
-        return 0
+        try:
+            return os.path.getsize(self.get_file_path(relative_path))
+        except FileNotFoundError:
+            return 0
 
     def file_exists(self, relative_path: str) -> bool:
         """Check if a file exists"""
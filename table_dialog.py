@@ -2,23 +2,225 @@
 Dialog for creating and editing tables and their fields
 """
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit,
-                             QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+                             QLabel, QPushButton, QTableView, QAbstractItemView,
                              QComboBox, QCheckBox, QMessageBox, QHeaderView,
-                             QWidget, QTabWidget, QFormLayout, QGroupBox,
-                             QTextEdit)
-from PyQt6.QtCore import Qt
+                             QTabWidget, QFormLayout, QGroupBox,
+                             QTextEdit, QStyledItemDelegate, QStyleOptionButton,
+                             QStyle, QApplication)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QPalette, QStandardItemModel, QStandardItem
 import json
+import re
 import config
 from database import DatabaseManager
 
 
+# Valid table names: letters, digits and underscores
+_IDENT_RE = re.compile(r'[A-Za-z0-9_]+\Z')
+
+# Field types whose options hold a choice list, reference settings, or either
+CHOICE_TYPES = frozenset({'dropdown', 'multiselect'})
+REFERENCE_TYPES = frozenset({'reference', 'multireference'})
+OPTION_TYPES = CHOICE_TYPES | REFERENCE_TYPES
+
+# Text-like field types that make sense as a reference's display field
+_DISPLAYABLE_TYPES = frozenset({'text', 'email', 'phone', 'url', 'number'})
+
+# Columns of the fields table
+(COL_NAME, COL_DISPLAY, COL_TYPE, COL_REQUIRED, COL_UNIQUE,
+ COL_SHOW_IN_LIST, COL_OPTIONS, COL_ACTIONS) = range(8)
+
+
+class FieldsModel(QAbstractTableModel):
+    """Table model over the fields being edited, one plain dict per row:
+    name, display_name, field_type, is_required, is_unique, show_in_list and
+    options (option list JSON, or reference settings JSON for reference types)
+    """
+
+    HEADERS = ["Field Name", "Display Name", "Type", "Required", "Unique", "Show in List", "Options", "Actions"]
+    # Text columns -> (row key, hint shown while empty)
+    TEXT_COLUMNS = {COL_NAME: ('name', "e.g., price"), COL_DISPLAY: ('display_name', "e.g., Price")}
+    # Check box columns -> row key
+    CHECK_COLUMNS = {COL_REQUIRED: 'is_required', COL_UNIQUE: 'is_unique', COL_SHOW_IN_LIST: 'show_in_list'}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        column = index.column()
+
+        if column in self.TEXT_COLUMNS:
+            key, hint = self.TEXT_COLUMNS[column]
+            value = row[key]
+            if role == Qt.ItemDataRole.EditRole:
+                return value
+            if role == Qt.ItemDataRole.DisplayRole:
+                return value or hint
+            if role == Qt.ItemDataRole.ForegroundRole and not value:
+                return QApplication.palette().color(QPalette.ColorRole.PlaceholderText)
+        elif column == COL_TYPE:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return row['field_type'].capitalize()
+            if role == Qt.ItemDataRole.EditRole:
+                return row['field_type']
+        elif column in self.CHECK_COLUMNS:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if row[self.CHECK_COLUMNS[column]] else Qt.CheckState.Unchecked
+        elif column == COL_OPTIONS:
+            # Options only apply to choice and reference types
+            if role == Qt.ItemDataRole.DisplayRole and row['field_type'] in OPTION_TYPES:
+                return "Edit"
+        elif column == COL_ACTIONS:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return "Remove"
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        row = self.rows[index.row()]
+        column = index.column()
+
+        if column in self.TEXT_COLUMNS and role == Qt.ItemDataRole.EditRole:
+            row[self.TEXT_COLUMNS[column][0]] = value
+        elif column == COL_TYPE and role == Qt.ItemDataRole.EditRole:
+            row['field_type'] = value
+            # The options button follows the type
+            options_index = index.siblingAtColumn(COL_OPTIONS)
+            self.dataChanged.emit(options_index, options_index)
+        elif column in self.CHECK_COLUMNS and role == Qt.ItemDataRole.CheckStateRole:
+            row[self.CHECK_COLUMNS[column]] = Qt.CheckState(value) == Qt.CheckState.Checked
+        else:
+            return False
+
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() in self.TEXT_COLUMNS or index.column() == COL_TYPE:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        elif index.column() in self.CHECK_COLUMNS:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def append_row(self, row: dict) -> int:
+        """Add a field row at the end and return its row number"""
+        position = len(self.rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self.rows.append(row)
+        self.endInsertRows()
+        return position
+
+    def extend_rows(self, rows: list):
+        """Add several field rows at the end in a single insertion"""
+        if not rows:
+            return
+        position = len(self.rows)
+        self.beginInsertRows(QModelIndex(), position, position + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def remove_row(self, position: int):
+        """Remove a field row"""
+        if 0 <= position < len(self.rows):
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self.rows[position]
+            self.endRemoveRows()
+
+    def set_options(self, position: int, options: str):
+        """Replace a row's options"""
+        self.rows[position]['options'] = options
+        index = self.index(position, COL_OPTIONS)
+        self.dataChanged.emit(index, index)
+
+
+class FieldTypeDelegate(QStyledItemDelegate):
+    """Edits the Type column with a combo box of config.FIELD_TYPES, created only while editing"""
+    # Items of config.FIELD_TYPES, built once and shared by every type editor
+    _type_model = None
+
+    @classmethod
+    def type_model(cls) -> QStandardItemModel:
+        """Shared model listing config.FIELD_TYPES (display text capitalized, UserRole = type)"""
+        if cls._type_model is None:
+            cls._type_model = QStandardItemModel()
+            for field_type in config.FIELD_TYPES:
+                item = QStandardItem(field_type.capitalize())
+                item.setData(field_type, Qt.ItemDataRole.UserRole)
+                cls._type_model.appendRow(item)
+        return cls._type_model
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.setModel(self.type_model())
+        # Commit as soon as a type is picked, so the options column follows it
+        combo.activated.connect(self.commit_editor)
+        return combo
+
+    @pyqtSlot()
+    def commit_editor(self):
+        """Write the type picked in the sending editor back to the model"""
+        self.commitData.emit(self.sender())
+
+    def setEditorData(self, editor, index):
+        position = editor.findData(index.data(Qt.ItemDataRole.EditRole))
+        if position >= 0:
+            editor.setCurrentIndex(position)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentData())
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """Draws a column's text as a push button and reports clicks on it by row"""
+    clicked = pyqtSignal(int)
+
+    def paint(self, painter, option, index):
+        text = index.data()
+        if not text:
+            return
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = text
+        button.state = QStyle.StateFlag.State_Enabled
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease and index.data()
+                and option.rect.contains(event.position().toPoint())):
+            self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
 class TableDialog(QDialog):
     def __init__(self, db: DatabaseManager, table_id: int = None, parent=None):
         super().__init__(parent)
         self.db = db
         self.table_id = table_id
         self.is_edit_mode = table_id is not None
-        self.fields = []
+        # Fields being edited, one dict per row (see FieldsModel)
+        self.fields_model = FieldsModel(self)
+        self.fields = self.fields_model.rows
+        # Field definitions as loaded from the database (edit mode), diffed against on save
+        self._loaded_fields = []
 
         self.setWindowTitle("Edit Table" if self.is_edit_mode else "New Table")
         self.resize(800, 600)
@@ -62,12 +264,18 @@ class TableDialog(QDialog):
         fields_group = QGroupBox("Fields")
         fields_layout = QVBoxLayout(fields_group)
 
-        # Field table
-        self.fields_table = QTableWidget()
-        self.fields_table.setColumnCount(8)
-        self.fields_table.setHorizontalHeaderLabels([
-            "Field Name", "Display Name", "Type", "Required", "Unique", "Show in List", "Options", "Actions"
-        ])
+        # Field table: a view over fields_model; editors exist only for the cell being edited
+        self.fields_table = QTableView()
+        self.fields_table.setModel(self.fields_model)
+        self.fields_table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.fields_table.setItemDelegateForColumn(COL_TYPE, FieldTypeDelegate(self.fields_table))
+        options_delegate = ButtonDelegate(self.fields_table)
+        # Queued, so the dialog opens (or the row goes) after the click is handled
+        options_delegate.clicked.connect(self.edit_field_options, Qt.ConnectionType.QueuedConnection)
+        self.fields_table.setItemDelegateForColumn(COL_OPTIONS, options_delegate)
+        remove_delegate = ButtonDelegate(self.fields_table)
+        remove_delegate.clicked.connect(self.remove_field_row, Qt.ConnectionType.QueuedConnection)
+        self.fields_table.setItemDelegateForColumn(COL_ACTIONS, remove_delegate)
         self.fields_table.horizontalHeader().setStretchLastSection(False)
         self.fields_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.fields_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
@@ -96,170 +304,96 @@ class TableDialog(QDialog):
 
         layout.addLayout(btn_layout)
 
+    @pyqtSlot()
     def add_field_row(self, field_data: dict = None):
         """Add a row to the fields table"""
-        row = self.fields_table.rowCount()
-        self.fields_table.insertRow(row)
-
-        # Field name
-        name_input = QLineEdit()
-        name_input.setPlaceholderText("e.g., price")
+        position = self.fields_model.append_row(self.field_row(field_data))
+
+        # A row added from the button starts with its name being typed
+        if not field_data:
+            index = self.fields_model.index(position, COL_NAME)
+            self.fields_table.setCurrentIndex(index)
+            if self.fields_table.state() != QAbstractItemView.State.EditingState:
+                self.fields_table.edit(index)
+
+    @staticmethod
+    def field_row(field_data: dict = None) -> dict:
+        """Build a fields table row from a stored field definition (or a blank row)"""
+        row = {
+            'name': '',
+            'display_name': '',
+            'field_type': config.FIELD_TYPES[0],
+            'is_required': False,
+            'is_unique': False,
+            'show_in_list': True,  # Default to checked
+            'options': ''
+        }
         if field_data:
-            name_input.setText(field_data.get('name', ''))
-        self.fields_table.setCellWidget(row, 0, name_input)
+            row['name'] = field_data.get('name', '')
+            row['display_name'] = field_data.get('display_name', '')
+            if field_data.get('field_type') in config.FIELD_TYPES:
+                row['field_type'] = field_data['field_type']
+            row['is_required'] = bool(field_data.get('is_required', False))
+            row['is_unique'] = bool(field_data.get('is_unique', False))
+            row['show_in_list'] = bool(field_data.get('show_in_list', True))
 
-        # Display name
-        display_input = QLineEdit()
-        display_input.setPlaceholderText("e.g., Price")
-        if field_data:
-            display_input.setText(field_data.get('display_name', ''))
-        self.fields_table.setCellWidget(row, 1, display_input)
-
-        # Type
-        type_combo = QComboBox()
-        for field_type in config.FIELD_TYPES:
-            type_combo.addItem(field_type.capitalize(), field_type)
-        if field_data:
-            index = type_combo.findData(field_data.get('field_type'))
-            if index >= 0:
-                type_combo.setCurrentIndex(index)
-        type_combo.currentIndexChanged.connect(lambda: self.on_type_changed(row))
-        self.fields_table.setCellWidget(row, 2, type_combo)
-
-        # Required
-        required_check = QCheckBox()
-        required_check.setStyleSheet("margin-left: 50%;")
-        if field_data:
-            required_check.setChecked(field_data.get('is_required', False))
-        self.fields_table.setCellWidget(row, 3, required_check)
-
-        # Unique
-        unique_check = QCheckBox()
-        unique_check.setStyleSheet("margin-left: 50%;")
-        if field_data:
-            unique_check.setChecked(field_data.get('is_unique', False))
-        self.fields_table.setCellWidget(row, 4, unique_check)
-
-        # Show in List
-        show_in_list_check = QCheckBox()
-        show_in_list_check.setStyleSheet("margin-left: 50%;")
-        if field_data:
-            show_in_list_check.setChecked(field_data.get('show_in_list', True))
-        else:
-            show_in_list_check.setChecked(True)  # Default to checked
-        self.fields_table.setCellWidget(row, 5, show_in_list_check)
-
-        # Options (for dropdown, multiselect, reference)
-        options_widget = QWidget()
-        options_layout = QHBoxLayout(options_widget)
-        options_layout.setContentsMargins(0, 0, 0, 0)
-
-        # Hidden input to store the options data
-        options_input = QLineEdit()
-        options_input.setVisible(False)
-        if field_data:
             # Preserve any stored options (dropdown/multiselect JSON)
             if field_data.get('options'):
-                options_input.setText(field_data.get('options', ''))
+                row['options'] = field_data.get('options', '')
 
             # For reference/multireference, options are not used; metadata lives in separate columns.
-            # Populate the hidden input with a JSON blob so a subsequent Save round-trips these values.
-            if field_data.get('field_type') in ['reference', 'multireference'] and not options_input.text():
+            # Keep them as a JSON blob in the row's options so a subsequent Save round-trips these values.
+            if field_data.get('field_type') in REFERENCE_TYPES and not row['options']:
                 ref_data = {
                     'table_id': field_data.get('reference_table_id'),
                     'display_field': field_data.get('reference_display_field'),
                     'cascade_delete': field_data.get('cascade_delete', False)
                 }
                 try:
-                    import json as _json
-                    options_input.setText(_json.dumps(ref_data))
-                except Exception:
+                    row['options'] = json.dumps(ref_data)
+                except (TypeError, ValueError):
                     # Fallback: simple string for table id if JSON fails
                     if ref_data.get('table_id') is not None:
-                        options_input.setText(str(ref_data['table_id']))
-        options_layout.addWidget(options_input)
+                        row['options'] = str(ref_data['table_id'])
 
-        options_btn = QPushButton("Edit")
-        options_btn.clicked.connect(lambda: self.edit_field_options(row))
-        options_layout.addWidget(options_btn)
-
-        self.fields_table.setCellWidget(row, 6, options_widget)
-
-        # Actions
-        actions_widget = QWidget()
-        actions_layout = QHBoxLayout(actions_widget)
-        actions_layout.setContentsMargins(0, 0, 0, 0)
-
-        btn_delete = QPushButton("Remove")
-        btn_delete.clicked.connect(lambda: self.remove_field_row(row))
-        actions_layout.addWidget(btn_delete)
-
-        self.fields_table.setCellWidget(row, 7, actions_widget)
-
-        # Update options visibility
-        self.on_type_changed(row)
-
-    def on_type_changed(self, row: int):
-        """Handle field type change"""
-        type_combo = self.fields_table.cellWidget(row, 2)
-        field_type = type_combo.currentData()
-
-        options_widget = self.fields_table.cellWidget(row, 6)
-
-        # Show options only for dropdown, multiselect, reference, multireference
-        needs_options = field_type in ['dropdown', 'multiselect', 'reference', 'multireference']
-        options_widget.setVisible(needs_options)
+        return row
 
+    @pyqtSlot(int)
     def edit_field_options(self, row: int):
         """Edit field options"""
-        type_combo = self.fields_table.cellWidget(row, 2)
-        field_type = type_combo.currentData()
-
-        options_widget = self.fields_table.cellWidget(row, 6)
-        options_input = options_widget.findChild(QLineEdit)
+        if not 0 <= row < len(self.fields):
+            return
+        field_type = self.fields[row]['field_type']
+        options = self.fields[row]['options']
 
-        if field_type in ['dropdown', 'multiselect']:
-            dialog = OptionsDialog(options_input.text(), parent=self)
+        if field_type in CHOICE_TYPES:
+            dialog = OptionsDialog(options, parent=self)
             if dialog.exec():
-                options_input.setText(dialog.get_options())
-        elif field_type in ['reference', 'multireference']:
+                self.fields_model.set_options(row, dialog.get_options())
+        elif field_type in REFERENCE_TYPES:
             # Parse current options (might be old format: just table_id, or new format: JSON)
             current_table_id = None
             current_display_field = None
-            if options_input.text():
-                try:
-                    import json
-                    data = json.loads(options_input.text())
-                    current_table_id = str(data.get('table_id', ''))
-                    current_display_field = data.get('display_field')
-                except:
-                    # Old format - just table ID
-                    current_table_id = options_input.text()
-
-            # Also get current cascade_delete setting if present
             current_cascade_delete = False
-            if options_input.text():
-                try:
-                    import json
-                    data = json.loads(options_input.text())
-                    current_cascade_delete = data.get('cascade_delete', False)
-                except:
-                    pass
+            if options:
+                table_id, current_display_field, current_cascade_delete = self._parse_reference(options)
+                if table_id is not None:
+                    current_table_id = str(table_id)
 
             dialog = ReferenceDialog(self.db, current_table_id, current_display_field, current_cascade_delete, parent=self)
             if dialog.exec():
                 # Store as JSON with table_id, display_field, and cascade_delete
-                import json
                 ref_data = {
                     'table_id': dialog.get_table_id(),
                     'display_field': dialog.get_display_field(),
                     'cascade_delete': dialog.get_cascade_delete()
                 }
-                options_input.setText(json.dumps(ref_data))
+                self.fields_model.set_options(row, json.dumps(ref_data))
 
+    @pyqtSlot(int)
     def remove_field_row(self, row: int):
         """Remove a field row"""
-        self.fields_table.removeRow(row)
+        self.fields_model.remove_row(row)
 
     def load_table_data(self):
         """Load existing table data"""
@@ -268,9 +402,15 @@ class TableDialog(QDialog):
             self.table_name_input.setText(table['name'])
             self.display_name_input.setText(table['display_name'])
 
-        fields = self.db.get_fields(self.table_id)
-        for field in fields:
-            self.add_field_row(field)
+        self._loaded_fields = self.db.get_fields(self.table_id)
+        # Insert all rows at once: one view update instead of one per field
+        self.fields_model.extend_rows([self.field_row(field) for field in self._loaded_fields])
+
+    def commit_pending_edit(self):
+        """Write a cell editor still open in the fields table back to the model"""
+        editor = QApplication.focusWidget()
+        if editor is not None and editor is not self.fields_table and self.fields_table.isAncestorOf(editor):
+            self.fields_table.commitData(editor)
 
     def validate_input(self) -> bool:
         """Validate the form input"""
@@ -284,13 +424,80 @@ class TableDialog(QDialog):
 
         # Validate table name format (alphanumeric and underscore only)
         table_name = self.table_name_input.text().strip()
-        if not table_name.replace('_', '').isalnum():
+        if not _IDENT_RE.match(table_name):
             QMessageBox.warning(self, "Validation Error",
                               "Table name can only contain letters, numbers, and underscores")
             return False
 
         return True
 
+    @staticmethod
+    def _parse_reference(options: str) -> tuple:
+        """Reference table id, display field and cascade delete flag from a row's options:
+        settings JSON, or just the table id (old format)
+        """
+        # Only settings JSON starts with '{'; skip the parser for bare table ids
+        data = None
+        if options.lstrip().startswith('{'):
+            try:
+                data = json.loads(options)
+            except json.JSONDecodeError:
+                pass
+        if isinstance(data, dict):
+            return data.get('table_id'), data.get('display_field'), data.get('cascade_delete', False)
+
+        # Old format - just table ID
+        try:
+            return int(options), None, False
+        except ValueError:
+            return None, None, False
+
+    def _read_row(self, row: int, existing_fields: dict = None) -> dict:
+        """Field definition to save for a fields table row, or None for a row without a name"""
+        field = self.fields[row]
+        field_name = field['name'].strip()
+        if not field_name:
+            return None
+
+        definition = {
+            'name': field_name,
+            'display_name': field['display_name'].strip(),
+            'field_type': field['field_type'],
+            'is_required': field['is_required'],
+            'is_unique': field['is_unique'],
+            'show_in_list': field['show_in_list'],
+            'options': field['options'] or None,
+            'reference_table_id': None,
+            'reference_display_field': None,
+            'cascade_delete': False,
+            'position': row
+        }
+
+        if definition['field_type'] in REFERENCE_TYPES:
+            if definition['options']:
+                (definition['reference_table_id'], definition['reference_display_field'],
+                 definition['cascade_delete']) = self._parse_reference(definition['options'])
+                # Options are not stored for reference types
+                definition['options'] = None
+            elif existing_fields and field_name in existing_fields:
+                # No options came back from UI (user didn't open the dialog). Preserve existing.
+                existing = existing_fields[field_name]
+                definition['reference_table_id'] = existing.get('reference_table_id')
+                definition['reference_display_field'] = existing.get('reference_display_field')
+                definition['cascade_delete'] = existing.get('cascade_delete', False)
+
+        return definition
+
+    def _add_field(self, table_id: int, definition: dict):
+        """Add a field read by _read_row to a table"""
+        self.db.add_field(
+            table_id, definition['name'], definition['display_name'],
+            definition['field_type'], definition['is_required'], definition['is_unique'],
+            definition['show_in_list'], definition['options'], definition['reference_table_id'],
+            definition['reference_display_field'], definition['position'], definition['cascade_delete']
+        )
+
+    @pyqtSlot()
     def save_table(self):
         """Save the table"""
         if not self.validate_input():
@@ -299,138 +506,73 @@ class TableDialog(QDialog):
         table_name = self.table_name_input.text().strip()
         display_name = self.display_name_input.text().strip()
 
+        # Keep what is being typed into a cell
+        self.commit_pending_edit()
+
         try:
-            if self.is_edit_mode:
-                # Update table metadata
-                self.db.cursor.execute(
-                    "UPDATE _tables SET display_name = ? WHERE id = ?",
-                    (display_name, self.table_id)
-                )
-
-                # Get existing fields
-                existing_fields = {f['name']: f for f in self.db.get_fields(self.table_id)}
-
-                # Track current field names to identify removed fields
-                current_field_names = set()
-
-                # Process fields
-                for row in range(self.fields_table.rowCount()):
-                    field_name = self.fields_table.cellWidget(row, 0).text().strip()
-                    if not field_name:
-                        continue
-
-                    current_field_names.add(field_name)
-
-                    field_display = self.fields_table.cellWidget(row, 1).text().strip()
-                    field_type = self.fields_table.cellWidget(row, 2).currentData()
-                    is_required = self.fields_table.cellWidget(row, 3).isChecked()
-                    is_unique = self.fields_table.cellWidget(row, 4).isChecked()
-                    show_in_list = self.fields_table.cellWidget(row, 5).isChecked()
-
-                    options_widget = self.fields_table.cellWidget(row, 6)
-                    options_input = options_widget.findChild(QLineEdit)
-                    options = options_input.text() if options_input.text() else None
-
-                    reference_table_id = None
-                    reference_display_field = None
-                    cascade_delete = False
-                    if field_type in ['reference', 'multireference']:
-                        if options:
-                            try:
-                                # Try to parse as JSON (new format)
-                                import json
-                                ref_data = json.loads(options)
-                                reference_table_id = ref_data.get('table_id')
-                                reference_display_field = ref_data.get('display_field')
-                                cascade_delete = ref_data.get('cascade_delete', False)
-                            except:
-                                # Old format - just table ID
-                                try:
-                                    reference_table_id = int(options)
-                                except Exception:
-                                    reference_table_id = None
-                            # Options are not stored for reference types
-                            options = None
-                        else:
-                            # No options came back from UI (user didn't open the dialog). Preserve existing.
-                            existing = existing_fields.get(field_name)
-                            if existing:
-                                reference_table_id = existing.get('reference_table_id')
-                                reference_display_field = existing.get('reference_display_field')
-                                cascade_delete = existing.get('cascade_delete', False)
-
-                    # Check if field already exists
-                    if field_name not in existing_fields:
-                        # New field - add it
-                        self.db.add_field(
-                            self.table_id, field_name, field_display,
-                            field_type, is_required, is_unique, show_in_list,
-                            options, reference_table_id, reference_display_field, row, cascade_delete
-                        )
-                    else:
-                        # Update existing field metadata
-                        field_id = existing_fields[field_name]['id']
-                        self.db.cursor.execute("""
+            # All metadata and schema changes commit (or roll back) together
+            with self.db.transaction():
+                if self.is_edit_mode:
+                    # Update table metadata
+                    self.db.cursor.execute(
+                        "UPDATE _tables SET display_name = ? WHERE id = ?",
+                        (display_name, self.table_id)
+                    )
+
+                    # Existing fields, as loaded when the dialog opened (it is modal, so still current)
+                    existing_fields = {f['name']: f for f in self._loaded_fields}
+
+                    # Named rows by field name, in row order
+                    current_fields = {}
+                    for row in range(len(self.fields)):
+                        definition = self._read_row(row, existing_fields)
+                        if definition is None:
+                            continue
+                        if definition['name'] in current_fields:
+                            raise ValueError(f"Duplicate field name: {definition['name']}")
+                        current_fields[definition['name']] = definition
+
+                    # New fields - add them (in row order, so their columns are too)
+                    for field_name, definition in current_fields.items():
+                        if field_name not in existing_fields:
+                            self._add_field(self.table_id, definition)
+
+                    # Update existing field metadata, as one batch
+                    updates = [
+                        (definition['display_name'], definition['field_type'],
+                         definition['is_required'], definition['is_unique'],
+                         definition['show_in_list'], definition['options'],
+                         definition['reference_table_id'], definition['reference_display_field'],
+                         definition['position'], definition['cascade_delete'],
+                         existing_fields[field_name]['id'])
+                        for field_name, definition in current_fields.items()
+                        if field_name in existing_fields
+                    ]
+                    if updates:
+                        self.db.cursor.executemany("""
                             UPDATE _fields
                             SET display_name = ?, field_type = ?, is_required = ?, is_unique = ?,
                                 show_in_list = ?, options = ?, reference_table_id = ?,
                                 reference_display_field = ?, position = ?, cascade_delete = ?
                             WHERE id = ?
-                        """, (field_display, field_type, is_required, is_unique, show_in_list,
-                              options, reference_table_id, reference_display_field, row, cascade_delete, field_id))
-                        self.db.connection.commit()
-
-                # Delete fields that were removed from the UI
-                for field_name, field_data in existing_fields.items():
-                    if field_name not in current_field_names:
-                        self.db.delete_field(field_data['id'])
-
-            else:
-                # Create new table
-                table_id = self.db.create_table(table_name, display_name)
-
-                # Add fields
-                for row in range(self.fields_table.rowCount()):
-                    field_name = self.fields_table.cellWidget(row, 0).text().strip()
-                    if not field_name:
-                        continue
-
-                    field_display = self.fields_table.cellWidget(row, 1).text().strip()
-                    field_type = self.fields_table.cellWidget(row, 2).currentData()
-                    is_required = self.fields_table.cellWidget(row, 3).isChecked()
-                    is_unique = self.fields_table.cellWidget(row, 4).isChecked()
-                    show_in_list = self.fields_table.cellWidget(row, 5).isChecked()
-
-                    options_widget = self.fields_table.cellWidget(row, 6)
-                    options_input = options_widget.findChild(QLineEdit)
-                    options = options_input.text() if options_input.text() else None
-
-                    reference_table_id = None
-                    reference_display_field = None
-                    cascade_delete = False
-                    if field_type in ['reference', 'multireference']:
-                        if options:
-                            try:
-                                # Try to parse as JSON (new format)
-                                import json
-                                ref_data = json.loads(options)
-                                reference_table_id = ref_data.get('table_id')
-                                reference_display_field = ref_data.get('display_field')
-                                cascade_delete = ref_data.get('cascade_delete', False)
-                            except:
-                                # Old format - just table ID
-                                try:
-                                    reference_table_id = int(options)
-                                except Exception:
-                                    reference_table_id = None
-                            # Options are not stored for reference types
-                            options = None
-
-                    self.db.add_field(
-                        table_id, field_name, field_display,
-                        field_type, is_required, is_unique, show_in_list,
-                        options, reference_table_id, reference_display_field, row, cascade_delete
-                    )
+                        """, updates)
+
+                    # Delete fields that were removed from the UI
+                    for field_name in existing_fields.keys() - current_fields.keys():
+                        self.db.delete_field(existing_fields[field_name]['id'])
+
+                    # The table and field metadata above were updated directly
+                    self.db.invalidate_schema_cache()
+
+                else:
+                    # Create new table
+                    table_id = self.db.create_table(table_name, display_name)
+
+                    # Add fields
+                    for row in range(len(self.fields)):
+                        definition = self._read_row(row)
+                        if definition is not None:
+                            self._add_field(table_id, definition)
 
             self.accept()
 
@@ -451,14 +593,19 @@ class OptionsDialog(QDialog):
         label = QLabel("Enter options (one per line):")
         layout.addWidget(label)
 
+        # Plain-text buffer: pasted text keeps no formatting, and long options don't wrap
         self.text_edit = QTextEdit()
+        self.text_edit.setAcceptRichText(False)
+        self.text_edit.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
         if current_options:
-            # Parse JSON array
-            try:
-                options = json.loads(current_options)
-                self.text_edit.setText('\n'.join(options))
-            except:
-                self.text_edit.setText(current_options)
+            # Parse JSON array; anything not starting with '[' is plain text, no parser needed
+            text = current_options
+            if current_options.lstrip().startswith('['):
+                try:
+                    text = '\n'.join(json.loads(current_options))
+                except (json.JSONDecodeError, TypeError):
+                    pass
+            self.text_edit.setPlainText(text)
         layout.addWidget(self.text_edit)
 
         # Buttons
@@ -478,12 +625,13 @@ class OptionsDialog(QDialog):
 
     def get_options(self) -> str:
         """Get options as JSON array string"""
-        text = self.text_edit.toPlainText().strip()
-        if not text:
+        # One option per non-blank line (splitlines also handles pasted CRLF text)
+        options = [line for line in map(str.strip, self.text_edit.toPlainText().splitlines()) if line]
+        if not options:
             return ""
 
-        options = [line.strip() for line in text.split('\n') if line.strip()]
-        return json.dumps(options)
+        # Compact, with non-ASCII labels stored as-is rather than \u-escaped
+        return json.dumps(options, ensure_ascii=False, separators=(',', ':'))
 
 
 class ReferenceDialog(QDialog):
@@ -502,17 +650,21 @@ class ReferenceDialog(QDialog):
         label = QLabel("Select the table to reference:")
         layout.addWidget(label)
 
+        # Tables listed in one model, built before the combo sees it rather than item by item
         self.table_combo = QComboBox()
-        tables = self.db.get_all_tables()
-        for table in tables:
-            self.table_combo.addItem(table['display_name'], table['id'])
+        tables_model = QStandardItemModel(self.table_combo)
+        for table in self.db.get_cached_tables():
+            item = QStandardItem(table['display_name'])
+            item.setData(table['id'], Qt.ItemDataRole.UserRole)
+            tables_model.appendRow(item)
+        self.table_combo.setModel(tables_model)
 
         if current_table_id:
             try:
                 index = self.table_combo.findData(int(current_table_id))
                 if index >= 0:
                     self.table_combo.setCurrentIndex(index)
-            except:
+            except (ValueError, TypeError):
                 pass
 
         # Connect table selection change to update fields
@@ -526,6 +678,8 @@ class ReferenceDialog(QDialog):
 
         self.field_combo = QComboBox()
         layout.addWidget(self.field_combo)
+        # Table the field combo was last filled for
+        self._last_table_id = None
 
         # Store current display field for later selection
         self.current_display_field = current_display_field
@@ -553,16 +707,21 @@ class ReferenceDialog(QDialog):
 
         layout.addLayout(btn_layout)
 
+    @pyqtSlot()
     def on_table_changed(self):
         """Update field dropdown when table selection changes"""
-        self.field_combo.clear()
-
         table_id = self.table_combo.currentData()
+        # Qt also signals index changes that keep the same table (e.g. model resets)
+        if table_id == self._last_table_id:
+            return
+        self._last_table_id = table_id
+
+        self.field_combo.clear()
         if table_id:
-            fields = self.db.get_fields(table_id)
+            fields = self.db.get_cached_fields(table_id)
             for field in fields:
                 # Only show text-like fields that make sense for display
-                if field['field_type'] in ['text', 'email', 'phone', 'url', 'number']:
+                if field['field_type'] in _DISPLAYABLE_TYPES:
                     self.field_combo.addItem(field['display_name'], field['name'])
 
             # Try to select the current display field if it exists
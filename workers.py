@@ -0,0 +1,65 @@
+"""
+Background task helpers for running slow work off the GUI thread
+"""
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by a Worker (QRunnable cannot emit signals itself)"""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+
+
+class Worker(QRunnable):
+    """
+    Run a callable on a QThreadPool thread and deliver its result via signals.
+    Database access from the callable uses that thread's own connection
+    (see DatabaseManager.get_thread_connection).
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        """Execute the callable and emit finished(result) or failed(message)"""
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+class ProgressWorker(Worker):
+    """
+    Worker for long tasks that report progress and can be cancelled: the callable
+    also receives progress(done, total), emitted as signals.progress, and
+    cancelled(), which turns True once cancel() was called.
+    """
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__(fn, *args, **kwargs)
+        self._cancelled = False
+
+    def cancel(self):
+        """Ask the task to stop at its next cancelled() check"""
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        """Whether cancel() was called"""
+        return self._cancelled
+
+    def run(self):
+        """Execute the callable with progress/cancelled hooks and emit its outcome"""
+        try:
+            result = self.fn(*self.args, progress=self.signals.progress.emit,
+                             cancelled=self.is_cancelled, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)